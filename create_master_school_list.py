@@ -4,6 +4,8 @@ Create master_school_list.csv by mapping schools to their Classification and Lea
 """
 
 import csv
+import functools
+import re
 
 CLASSIFICATION_MAP = {
     "6A": {
@@ -31,149 +33,156 @@ CLASSIFICATION_MAP = {
 }
 
 
+# The school-type words dropped from a name, in one pass. The old chain of
+# replaces took " high school" out before " senior high", hence the lookahead:
+# "X Senior High School" still comes out as "x senior".
+_SCHOOL_WORDS = re.compile(r" high school| senior high(?! school)| high| school")
+_PUNCTUATION = str.maketrans("", "", ".'")
+
+
+@functools.lru_cache(maxsize=None)
 def normalize_name(name):
     """Normalize school name for matching."""
-    name = name.strip().lower()
-    name = name.replace(" high school", "")
-    name = name.replace(" senior high", "")
-    name = name.replace(" high", "")
-    name = name.replace(" school", "")
-    name = name.replace(".", "")
-    name = name.replace("'", "")
-    return name.strip()
+    name = _SCHOOL_WORDS.sub("", name.strip().lower())
+    return name.translate(_PUNCTUATION).strip()
+
 
+def _index_keys():
+    """Normalize every key name once.
 
+    Returns the keys sorted longest-first, so more specific names are tried
+    before shorter ones ("north bend" before "bend"). The sort is stable, so
+    keys of equal length resolve in CLASSIFICATION_MAP order.
+    """
+    keys = []
+    for classification, leagues in CLASSIFICATION_MAP.items():
+        for league, schools in leagues.items():
+            for key_school in schools:
+                normalized_key = normalize_name(key_school)
+                keys.append((normalized_key, classification, league))
+    keys.sort(key=lambda x: len(x[0]), reverse=True)
+    return tuple(keys)
+
+
+# Sorted once at import; the matcher only ever iterates these.
+_KEYS = _index_keys()
+_MULTIWORD = tuple(k for k in _KEYS if " " in k[0])
+_SINGLE_WORD = tuple(k for k in _KEYS if " " not in k[0])
+
+# Every test below belongs to one key, and the key earliest in _KEYS whose
+# test holds wins — whichever kind of test it is. "Mountainside La Grande" is
+# Mountainside, because that key is longer than "la grande". Each kind of test
+# reports the best rank it found and the matcher takes the smallest. A key
+# listed twice ranks at its first appearance.
+_RANK = {k[0]: i for i, k in reversed(list(enumerate(_KEYS)))}
+
+# One pass over the school name finds every multi-word key it contains: the
+# zero-width lookahead lets matches overlap, and listing the alternatives
+# longest-first makes each position report its best-ranked key.
+_MULTIWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(k[0]) for k in _MULTIWORD) + "))")
+
+# Names that don't contain their key spelled the way CLASSIFICATION_MAP has
+# it. Each alternative is a set of lookaheads anchored at the start of the
+# name, listed in the rank order of its key, so the first alternative that
+# holds is the best-ranked one. "Central (Independence)" is tested on the raw
+# name instead; see find_classification_and_league.
+_SPECIAL_PATTERNS = (
+    ("st_marys_medford", "st marys (medford)", r"(?=.*st mary)(?=.*medford)"),   # "St Mary's of Medford"
+    ("trinity", "trinity academy", r"(?=.*trinity)"),                            # "Trinity Acad."
+    ("riverside_wlwv", "riverside wlwv", r"(?=.*riverside)(?=.*(?:west linn|wilsonville))"),
+    ("weston", "weston-mcewen", r"(?=.*weston)(?=.*mcewen)"),
+    ("four_rivers", "four rivers", r"(?=.*four rivers)"),                        # "Four Rivers Charter"
+    ("boardman", "riverside", r"(?=.*boardman)"),                                # "Riverside (Boardman)"
+    ("stanfield", "stanfield", r"(?=.*stanfield)"),                              # "Stanfield / Echo"
+    ("barlow", "barlow", r"(?=.*barlow)"),                                       # "Sam Barlow"
+    ("wells", "wells", r"(?=.*wells)(?=.*barnett)"),                             # "Ida B. Wells-Barnett"
+    ("ione", "ione", r"(?=.*ione)(?=.*heppner)"),                                # "Ione-Heppner"
+    ("oes", "oes", r"(?=.*oregon episcopal)"),                                   # "Oregon Episcopal School"
+)
+_SPECIAL = re.compile("^(?:" + "|".join(
+    f"(?P<{group}>{pattern})"
+    for group, key, pattern in sorted(_SPECIAL_PATTERNS, key=lambda p: _RANK[p[1]])) + ")")
+_SPECIAL_RANK = {group: _RANK[key] for group, key, _ in _SPECIAL_PATTERNS}
+
+
+@functools.lru_cache(maxsize=None)
 def find_classification_and_league(school_name):
     """
     Find the classification and league for a school using partial matching.
     Returns (classification, league) or ("Other", "Other") if not found.
+    The answer depends only on the name, so repeats come from the cache.
     """
     normalized_school = normalize_name(school_name)
-
-    # Build a list of all possible matches with their classifications
-    # Sort by specificity (longer matches first) to avoid false positives
-    matches = []
-
-    for classification, leagues in CLASSIFICATION_MAP.items():
-        for league, schools in leagues.items():
-            for key_school in schools:
-                normalized_key = normalize_name(key_school)
-                matches.append((normalized_key, classification, league, len(normalized_key)))
-
-    # Sort by length descending to match longer/more specific names first
-    matches.sort(key=lambda x: x[3], reverse=True)
-
-    for normalized_key, classification, league, _ in matches:
-        # Exact match
-        if normalized_school == normalized_key:
-            return classification, league
-
-        # Multi-word exact matches (e.g., "valley catholic", "la grande")
-        # But make sure the school name starts with the key or the key is the main part
-        if " " in normalized_key and normalized_key in normalized_school:
-            # Don't match "West Linn" to "Riverside (West Linn - Wilsonville)"
-            # Only match if it's the primary school name, not just mentioned in parentheses
-            if normalized_school.startswith(normalized_key) or "(" not in school_name:
-                return classification, league
-
-        # Handle specific school name patterns
-
-        # "Sam Barlow" should match "Barlow"
-        if normalized_key == "barlow" and "barlow" in normalized_school:
-            return classification, league
-
-        # "Ida B. Wells-Barnett" should match "Wells"
-        if normalized_key == "wells" and "wells" in normalized_school and "barnett" in normalized_school:
-            return classification, league
-
-        # "Oregon Episcopal School" should match "OES"
-        if normalized_key == "oes" and ("oregon episcopal" in normalized_school or normalized_school == "oes"):
-            return classification, league
-
-        # "Central (Independence)" should match "Central" only in Mid-Willamette context
-        if normalized_key == "central" and "independence" in school_name.lower():
-            return classification, league
-
-        # "Ione-Heppner" should match "Ione"
-        if normalized_key == "ione" and "ione" in normalized_school and "heppner" in normalized_school:
-            return classification, league
-
-        # "St Mary's of Medford" should match "St. Mary's (Medford)"
-        if "st mary" in normalized_key and "medford" in normalized_key and "st mary" in normalized_school and "medford" in normalized_school:
-            return classification, league
-
-        # "Riverside (Boardman)" should match "Riverside" in Special District 4
-        if normalized_key == "riverside" and "boardman" in normalized_school:
-            return classification, league
-
-        # "Riverside (West Linn - Wilsonville)" should match "Riverside WLWV"
-        if "riverside wlwv" in normalized_key and "riverside" in normalized_school and ("west linn" in normalized_school or "wilsonville" in normalized_school):
-            return classification, league
-
-        # "Four Rivers Charter" should match "Four Rivers"
-        if normalized_key == "four rivers" and "four rivers" in normalized_school:
-            return classification, league
-
-        # "Trinity Academy" should match "Trinity Academy" or "Trinity Acad."
-        if "trinity" in normalized_key and "trinity" in normalized_school:
-            return classification, league
-
-        # "Weston-McEwen" should match "Weston-McEwen"
-        if "weston" in normalized_key and "weston" in normalized_school and "mcewen" in normalized_school:
-            return classification, league
-
-        # "Stanfield" should match "Stanfield" or "Stanfield / Echo"
-        if normalized_key == "stanfield" and "stanfield" in normalized_school:
-            return classification, league
-
-        # Single-word matches (but avoid false positives like "Bend" matching "North Bend")
-        if " " not in normalized_key:
-            # Avoid matching "Bend" to "North Bend", "Central" to "Central Catholic", etc.
-            words = normalized_school.split()
-            if normalized_key in words:
-                return classification, league
-
-            # Also check if it's the main part of the school name
-            # For schools like "Creswell High School" should match "Creswell"
-            if normalized_school.startswith(normalized_key + " ") or normalized_school == normalized_key:
-                return classification, league
-
-    return "Other", "Other"
+    ranks = []
+
+    # Exact match
+    if normalized_school in _RANK:
+        ranks.append(_RANK[normalized_school])
+
+    # Multi-word exact matches (e.g., "valley catholic", "la grande")
+    # But make sure the school name starts with the key or the key is the main part.
+    # Don't match "West Linn" to "Riverside (West Linn - Wilsonville)": with a
+    # parenthetical in the name, only a key the name starts with counts.
+    if "(" in school_name:
+        m = _MULTIWORD_RE.match(normalized_school)
+        found = [m.group(1)] if m else []
+    else:
+        found = [m.group(1) for m in _MULTIWORD_RE.finditer(normalized_school)]
+    ranks.extend(_RANK[key] for key in found)
+
+    # Handle specific school name patterns
+    m = _SPECIAL.search(normalized_school)
+    if m:
+        ranks.append(_SPECIAL_RANK[m.lastgroup])
+
+    # "Central (Independence)" should match "Central" only in Mid-Willamette context
+    if "independence" in school_name.lower():
+        ranks.append(_RANK["central"])
+
+    # Single-word matches (but avoid false positives like "Bend" matching "North Bend")
+    words = normalized_school.split()
+    for normalized_key, _, _ in _SINGLE_WORD:
+        # Avoid matching "Bend" to "North Bend", "Central" to "Central Catholic", etc.
+        # Also check if it's the main part of the school name
+        # For schools like "Creswell High School" should match "Creswell"
+        if normalized_key in words or normalized_school.startswith(normalized_key + " "):
+            ranks.append(_RANK[normalized_key])
+            break
+
+    if not ranks:
+        return "Other", "Other"
+    _, classification, league = _KEYS[min(ranks)]
+    return classification, league
 
 
 def create_master_school_list(input_file, output_file):
-    """Create master school list with classification and league mappings."""
-    schools = []
-    unmatched = []
+    """Create master school list with classification and league mappings.
 
-    with open(input_file, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
+    Rows are written as they are read; only the unmatched names are kept.
+    """
+    total = 0
+    unmatched = []
+    with open(input_file, "r", encoding="utf-8") as src, \
+            open(output_file, "w", encoding="utf-8", newline="") as dst:
+        reader = csv.reader(src)
+        header = next(reader)
+        id_col = header.index("id")
+        name_col = header.index("name")
+
+        writer = csv.writer(dst)
+        writer.writerow(("School_ID", "School_Name", "Classification", "League_District"))
         for row in reader:
-            school_id = row["id"]
-            school_name = row["name"]
-
+            school_id, school_name = row[id_col], row[name_col]
             classification, league = find_classification_and_league(school_name)
-
-            schools.append({
-                "School_ID": school_id,
-                "School_Name": school_name,
-                "Classification": classification,
-                "League_District": league
-            })
-
+            writer.writerow((school_id, school_name, classification, league))
+            total += 1
             if classification == "Other":
                 unmatched.append(school_name)
 
-    # Write output
-    with open(output_file, "w", encoding="utf-8", newline="") as f:
-        fieldnames = ["School_ID", "School_Name", "Classification", "League_District"]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(schools)
-
     print(f"Created {output_file}")
-    print(f"Total schools: {len(schools)}")
-    print(f"Matched: {len(schools) - len(unmatched)}")
+    print(f"Total schools: {total}")
+    print(f"Matched: {total - len(unmatched)}")
     print(f"Unmatched: {len(unmatched)}")
 
     if unmatched:
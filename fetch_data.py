@@ -3,17 +3,28 @@
 Fetch dual match data for Oregon schools from the TennisReporting API.
 
 This script reads school IDs from oregon_schools.csv and fetches
-dual match data for each school with a 1-second delay between requests.
+dual match data for each school. Up to MAX_WORKERS requests are in flight at
+once, and a shared rate.TokenBucket spaces their starts so the API sees at
+most MAX_WORKERS requests per REQUEST_DELAY.
 """
 
 import csv
 import json
-import time
 import os
 import argparse
+import zipfile
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import requests
 
+from rate import TokenBucket
+
+try:
+    import orjson
+except ImportError:  # optional: save_school_data falls back to the stdlib
+    orjson = None
+
 # Configuration
 INPUT_FILE = "oregon_schools.csv"
 OUTPUT_DIR = "match_data"
@@ -21,7 +32,12 @@ API_BASE_URL = "https://api.tennisreporting.com/report/school"
 # api.v2.tennisreporting.com was retired around 2026-04-24; api.tennisreporting.com
 # (no v2) serves the same /report/school endpoint with the same payload shape.
 API_BASE_URL_FALLBACK = "https://api.v2.tennisreporting.com/report/school"
-REQUEST_DELAY = 1  # seconds between requests
+REQUEST_DELAY = 1  # seconds; the pool starts at most MAX_WORKERS requests per REQUEST_DELAY
+# ETag/Last-Modified per saved school file, with the year, gender and level of
+# the request that wrote it, kept in the output dir. No .json suffix: the
+# readers of data/<year>/ treat every *.json there as a school file.
+VALIDATORS_FILE = ".http_validators"
+MAX_WORKERS = 8  # concurrent requests in flight
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -31,21 +47,54 @@ HEADERS = {
 }
 
 
-def load_school_ids(csv_file: str) -> list[dict]:
-    """Load school IDs and names from the CSV file."""
-    schools = []
+def load_school_ids(csv_file: str) -> Iterator[dict]:
+    """Yield school IDs and names from the CSV file, one row at a time.
+
+    The file is opened on the first next(), so a missing file or column
+    surfaces there rather than at the call.
+    """
     with open(csv_file, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            schools.append({
+        for row in csv.DictReader(f):
+            yield {
                 "id": row["id"],
                 "name": row.get("name", ""),
                 "city": row.get("city", ""),
-            })
-    return schools
+            }
+
 
+# Returned by fetch_school_data when the server answers 304: the copy on disk is current.
+NOT_MODIFIED = object()
 
-def fetch_school_data(school_id: str, year: int, gender_id: int = 1, is_not_varsity: int = 0) -> dict | None:
+
+def load_validators(output_dir: str) -> dict:
+    """Load the ETag/Last-Modified sidecar for an output directory."""
+    try:
+        with open(os.path.join(output_dir, VALIDATORS_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_validators(output_dir: str, validators: dict):
+    """Write the ETag/Last-Modified sidecar back to the output directory."""
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, VALIDATORS_FILE), "w", encoding="utf-8") as f:
+        json.dump(validators, f, indent=2, sort_keys=True)
+
+
+def make_session(pool_size: int = MAX_WORKERS) -> requests.Session:
+    """A keep-alive session carrying HEADERS, with a connection pool per host
+    large enough for every worker, so TLS handshakes happen once per connection
+    rather than once per school."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    return session
+
+
+def fetch_school_data(school_id: str, year: int, gender_id: int = 1, is_not_varsity: int = 0,
+                      validators: dict | None = None, session: requests.Session | None = None) -> dict | None:
     """
     Fetch dual match data for a school from the API.
 
@@ -58,25 +107,48 @@ def fetch_school_data(school_id: str, year: int, gender_id: int = 1, is_not_vars
         year: The year to fetch data for
         gender_id: 1 for boys, 2 for girls
         is_not_varsity: 0 for varsity, 1 for JV
+        validators: The school's last {"etag", "last_modified"}, sent as
+            If-None-Match / If-Modified-Since and refreshed in place from a
+            200 response. Only pass it when the previous response is on disk.
+        session: Session to send the request on (see make_session); a
+            one-off request is made without one.
 
     Returns:
-        The JSON response data or None if both hosts failed.
+        The JSON response data, NOT_MODIFIED if the server answered 304, or
+        None if both hosts failed.
     """
+    headers = HEADERS
+    if validators:
+        headers = dict(HEADERS)
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
     params = {
         "year": year,
         "genderId": gender_id,
         "isNotVarsity": is_not_varsity,
     }
 
+    get = session.get if session is not None else requests.get
     last_err = None
     for base in (API_BASE_URL, API_BASE_URL_FALLBACK):
         url = f"{base}/{school_id}"
         try:
-            response = requests.get(url, headers=HEADERS, params=params, timeout=30)
+            response = get(url, headers=headers, params=params, timeout=30)
             if 500 <= response.status_code < 600:
                 last_err = f"HTTP {response.status_code} at {base}"
                 continue
+            if response.status_code == 304:
+                return NOT_MODIFIED
             response.raise_for_status()
+            if validators is not None:
+                validators.clear()
+                if response.headers.get("ETag"):
+                    validators["etag"] = response.headers["ETag"]
+                if response.headers.get("Last-Modified"):
+                    validators["last_modified"] = response.headers["Last-Modified"]
             return response.json()
         except requests.exceptions.HTTPError as e:
             print(f"  HTTP error: {e.response.status_code}")
@@ -90,18 +162,109 @@ def fetch_school_data(school_id: str, year: int, gender_id: int = 1, is_not_vars
     return None
 
 
+def school_json_path(output_dir: str, school_id: str, gender_id: int) -> str:
+    """Path of one school's saved JSON in an output directory."""
+    return os.path.join(output_dir, f"school_{school_id}_gender_{gender_id}.json")
+
+
+def _has_exponent_float(data) -> bool:
+    """Whether any float in `data` is NaN, infinite, or spelled with an exponent."""
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+        elif isinstance(value, float):
+            spelled = repr(value)
+            if "e" in spelled or "n" in spelled:  # 1e-05, 1e+16, nan, inf
+                return True
+    return False
+
+
+def render_school_data(data: dict) -> bytes:
+    """The bytes of one school's JSON file."""
+    # merge_entered_data.py compares against the json.dumps(indent=2) spelling,
+    # so orjson is only used where its output is the same bytes. It differs on
+    # non-ASCII text and \x7f (written raw, not escaped), on floats json writes
+    # with an exponent or as NaN/Infinity (1e-05 comes out as 0.00001, 1e+16 as
+    # 1e16, NaN as null), and it refuses ints past 64 bits and non-str keys.
+    # Any of those sends the payload through json instead.
+    payload = None
+    if orjson is not None and not _has_exponent_float(data):
+        try:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except orjson.JSONEncodeError:
+            pass
+    if payload is None or not payload.isascii() or b"\x7f" in payload:
+        payload = json.dumps(data, indent=2).encode("utf-8")
+    return payload
+
+
 def save_school_data(school_id: str, data: dict, output_dir: str, year: int, gender_id: int):
-    """Save school data to a JSON file."""
-    os.makedirs(output_dir, exist_ok=True)
-    filename = f"school_{school_id}_gender_{gender_id}.json"
-    filepath = os.path.join(output_dir, filename)
+    """Save school data to a JSON file. output_dir must already exist."""
+    filepath = school_json_path(output_dir, school_id, gender_id)
+    with open(filepath, "wb") as f:
+        f.write(render_school_data(data))
 
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    return filepath
+
+
+def save_parquet(rows: list[dict], filepath: str):
+    """Write every fetched payload to one zstd-compressed Parquet file.
+
+    One row per school: school_id, year, gender_id, is_not_varsity, and the
+    API response as a JSON string in `payload`.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
 
+    parent = os.path.dirname(filepath)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    rows = sorted(rows, key=lambda r: r["school_id"])  # workers finish in any order
+    pq.write_table(pa.Table.from_pylist(rows), filepath, compression="zstd")
     return filepath
 
 
+def fetch_and_save(school: dict, args, is_not_varsity: int, validators: dict,
+                   session: requests.Session | None = None,
+                   bucket: TokenBucket | None = None) -> tuple[dict | None, str | None]:
+    """Fetch one school's data and save it, waiting on `bucket` for a request slot.
+
+    The request is conditional when the school's file on disk was written by
+    this same year, gender and level, and a 304 reuses that file. The file
+    name carries no year or level, so a file left by any other request is
+    fetched in full. `validators` is the run-wide sidecar map, keyed by file
+    name; only this school's entry is replaced.
+
+    Returns (data, saved path). Nothing is saved when the run collects into
+    a Parquet or zip file instead, and both are None if the fetch failed.
+    """
+    school_id = school["id"]
+    existing = school_json_path(args.output, school_id, args.gender)
+    key = os.path.basename(existing)
+    request = {"year": args.year, "gender": args.gender, "is_not_varsity": is_not_varsity}
+    saved = validators.get(key, {})
+    entry = {}
+    if os.path.exists(existing) and all(saved.get(k) == v for k, v in request.items()):
+        entry = {k: saved[k] for k in ("etag", "last_modified") if k in saved}
+    if bucket is not None:
+        bucket.acquire()
+    data = fetch_school_data(school_id, args.year, args.gender, is_not_varsity, validators=entry,
+                             session=session)
+    if data is NOT_MODIFIED:
+        with open(existing, "r", encoding="utf-8") as f:
+            return json.load(f), (None if args.parquet or args.zip else existing)
+    if not data:
+        return None, None
+    validators[key] = {**request, **entry}
+    if args.parquet or args.zip:
+        return data, None
+    return data, save_school_data(school_id, data, args.output, args.year, args.gender)
+
+
 def main():
     """Main function to fetch dual match data for all Oregon schools."""
     parser = argparse.ArgumentParser(description="Fetch dual match data for Oregon schools")
@@ -110,8 +273,24 @@ def main():
     parser.add_argument("--jv", action="store_true", help="Fetch JV instead of varsity")
     parser.add_argument("--input", type=str, default=INPUT_FILE, help="Input CSV file")
     parser.add_argument("--output", type=str, default=OUTPUT_DIR, help="Output directory")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS,
+                        help=f"Concurrent requests (default: {MAX_WORKERS}; 1 fetches one school at a time)")
+    single_file = parser.add_mutually_exclusive_group()
+    single_file.add_argument("--parquet", type=str, metavar="PATH",
+                             help="Write all schools to one Parquet file instead of a JSON file per school "
+                                  "(generate_site.py reads the JSON files)")
+    single_file.add_argument("--zip", type=str, metavar="PATH",
+                             help="Write the per-school JSON files into one deflated zip archive instead "
+                                  "of the output directory (unzip it there for generate_site.py)")
     args = parser.parse_args()
 
+    if args.parquet:
+        try:
+            import pyarrow.parquet  # noqa: F401 - checked before spending a run on fetches
+        except ImportError:
+            print("pyarrow is not installed (pip install pyarrow)")
+            return
+
     is_not_varsity = 1 if args.jv else 0
     gender_label = "boys" if args.gender == 1 else "girls"
     level_label = "JV" if args.jv else "varsity"
@@ -119,7 +298,9 @@ def main():
     # Load school IDs
     print(f"Loading schools from {args.input}...")
     try:
-        schools = load_school_ids(args.input)
+        # The pool submits every school up front and the progress lines need
+        # the count, so this caller collects the rows.
+        schools = list(load_school_ids(args.input))
     except FileNotFoundError:
         print(f"Error: {args.input} not found. Run fetch_oregon_schools.py first.")
         return
@@ -133,30 +314,69 @@ def main():
 
     successful = 0
     failed = 0
+    rows = []
+    validators = load_validators(args.output)
+    archive = None
+    if args.zip:
+        parent = os.path.dirname(args.zip)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        archive = zipfile.ZipFile(args.zip, "w", zipfile.ZIP_DEFLATED)
+    elif not args.parquet:
+        os.makedirs(args.output, exist_ok=True)  # once, not per school
 
-    for i, school in enumerate(schools, 1):
-        school_id = school["id"]
-        school_name = school.get("name", f"School {school_id}")
-
-        print(f"[{i}/{len(schools)}] Fetching {school_name} (ID: {school_id})...", end=" ")
-
-        data = fetch_school_data(school_id, args.year, args.gender, is_not_varsity)
+    # The work is all network wait, so threads overlap it fine; results are
+    # reported in completion order.
+    workers = max(1, args.workers)
+    bucket = TokenBucket(REQUEST_DELAY / workers)
+    # ZipFile is not thread-safe, so archive members are written here on the
+    # main thread as results arrive.
+    with make_session(workers) as session, ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(fetch_and_save, school, args, is_not_varsity, validators, session, bucket): school
+            for school in schools
+        }
+        for i, future in enumerate(as_completed(futures), 1):
+            school = futures[future]
+            school_id = school["id"]
+            school_name = school.get("name", f"School {school_id}")
+            data, filepath = future.result()
 
-        if data:
-            filepath = save_school_data(school_id, data, args.output, args.year, args.gender)
-            print(f"OK -> {filepath}")
-            successful += 1
-        else:
-            print("FAILED")
-            failed += 1
+            if data:
+                if args.parquet:
+                    rows.append({
+                        "school_id": int(school_id),
+                        "year": args.year,
+                        "gender_id": args.gender,
+                        "is_not_varsity": is_not_varsity,
+                        "payload": json.dumps(data, ensure_ascii=False),
+                    })
+                    print(f"[{i}/{len(schools)}] {school_name} (ID: {school_id}) OK")
+                elif archive is not None:
+                    name = os.path.basename(school_json_path("", school_id, args.gender))
+                    archive.writestr(name, render_school_data(data))
+                    print(f"[{i}/{len(schools)}] {school_name} (ID: {school_id}) OK -> {args.zip}:{name}")
+                else:
+                    print(f"[{i}/{len(schools)}] {school_name} (ID: {school_id}) OK -> {filepath}")
+                successful += 1
+            else:
+                print(f"[{i}/{len(schools)}] {school_name} (ID: {school_id}) FAILED")
+                failed += 1
 
-        # Delay between requests (except for the last one)
-        if i < len(schools):
-            time.sleep(REQUEST_DELAY)
+    if archive is not None:
+        archive.close()
+    elif not args.parquet:
+        save_validators(args.output, validators)
 
     print("-" * 60)
     print(f"Completed: {successful} successful, {failed} failed")
-    print(f"Data saved to {args.output}/")
+    if args.parquet:
+        if rows:
+            print(f"Data saved to {save_parquet(rows, args.parquet)}")
+    elif args.zip:
+        print(f"Data saved to {args.zip}")
+    else:
+        print(f"Data saved to {args.output}/")
 
 
 if __name__ == "__main__":
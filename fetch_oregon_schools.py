@@ -3,19 +3,27 @@
 Fetch all Oregon schools from the TennisReporting API.
 
 This script queries the API for each letter a-z, collects all schools
-with state='OR', and saves them to oregon_schools.csv.
+with state='OR', and saves them to oregon_schools.csv. Up to MAX_WORKERS
+letters are in flight at once. Their starts are spaced by an interval that
+shrinks while the API answers normally and doubles when it answers 429/503
+(see AdaptiveDelay).
 
 Note: The search endpoint may require authentication. If you get 401 errors,
 you may need to provide an API key or authentication token.
 """
 
 import csv
-import time
 import string
+from concurrent.futures import ThreadPoolExecutor
 import requests
 
+from rate import TokenBucket
+
 API_BASE_URL = "https://api.v2.tennisreporting.com/search/school"
 OUTPUT_FILE = "oregon_schools.csv"
+MAX_WORKERS = 6  # concurrent letter queries
+THROTTLED = (429, 503)  # responses that mean "slow down"
+THROTTLE_RETRIES = 3  # retries of a throttled letter before giving up on it
 
 
 HEADERS = {
@@ -26,11 +34,53 @@ HEADERS = {
 }
 
 
-def fetch_schools_for_letter(letter: str) -> list[dict]:
-    """Fetch schools matching a given letter from the API."""
+class AdaptiveDelay(TokenBucket):
+    """A TokenBucket, shared by every worker, whose interval follows the API.
+
+    Starts at `initial` and halves after each normal response, down to
+    `floor`. A 429/503 doubles it, up to `ceiling`, and a Retry-After header
+    in seconds is honored even past the ceiling.
+    """
+
+    def __init__(self, initial: float = 0.1, floor: float = 0.05, ceiling: float = 8.0):
+        super().__init__(initial)
+        self.floor = floor
+        self.ceiling = ceiling
+
+    def update(self, response) -> None:
+        with self._lock:
+            if response.status_code not in THROTTLED:
+                self.interval = max(self.interval * 0.5, self.floor)
+                return
+            self.interval = min(self.interval * 2, self.ceiling)
+            try:
+                self.interval = max(self.interval, float(response.headers.get("Retry-After", "")))
+            except ValueError:  # absent, or an HTTP date
+                pass
+
+
+def fetch_schools_for_letter(letter: str, session: requests.Session | None = None,
+                             pacer: AdaptiveDelay | None = None) -> list[dict]:
+    """Fetch schools matching a given letter from the API.
+
+    Pass a session carrying HEADERS to reuse its connection across letters.
+    With a pacer, each request waits for its slot, every response feeds it,
+    and a throttled letter is retried in a later slot.
+    """
     url = f"{API_BASE_URL}?term={letter}"
     try:
-        response = requests.get(url, headers=HEADERS, timeout=30)
+        for attempt in range(THROTTLE_RETRIES + 1):
+            if pacer is not None:
+                pacer.acquire()
+            if session is not None:
+                response = session.get(url, timeout=30)
+            else:
+                response = requests.get(url, headers=HEADERS, timeout=30)
+            if pacer is None:
+                break
+            pacer.update(response)
+            if response.status_code not in THROTTLED or attempt == THROTTLE_RETRIES:
+                break
         response.raise_for_status()
         return response.json()
     except requests.exceptions.HTTPError as e:
@@ -46,17 +96,20 @@ def fetch_schools_for_letter(letter: str) -> list[dict]:
         return []
 
 
+_OREGON = frozenset({"OR", "Oregon"})
+
+
+def _state(school: dict):
+    """A school's state, from either the flat or the nested structure."""
+    state = school.get("state")
+    if isinstance(state, dict):
+        return state.get("abbr") or state.get("name")
+    return state
+
+
 def filter_oregon_schools(schools: list[dict]) -> list[dict]:
     """Filter schools to only include those in Oregon (state='OR')."""
-    oregon_schools = []
-    for school in schools:
-        # Handle both flat structure and nested structure
-        state = school.get("state")
-        if isinstance(state, dict):
-            state = state.get("abbr") or state.get("name")
-        if state == "OR" or state == "Oregon":
-            oregon_schools.append(school)
-    return oregon_schools
+    return [school for school in schools if _state(school) in _OREGON]
 
 
 def extract_school_info(school: dict) -> dict:
@@ -84,23 +137,27 @@ def main():
     print(f"URL: {API_BASE_URL}")
     print("-" * 50)
 
-    for letter in string.ascii_lowercase:
-        print(f"Searching for schools starting with '{letter}'...", end=" ")
-
-        schools = fetch_schools_for_letter(letter)
-        or_schools = filter_oregon_schools(schools)
+    # The pool's connections are kept alive across all 26 queries. map()
+    # yields in letter order, and the merge below stays on this thread.
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        session.headers.update(HEADERS)
+        session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=MAX_WORKERS))
+        letters = string.ascii_lowercase
+        pacer = AdaptiveDelay()
+        results = pool.map(fetch_schools_for_letter, letters, [session] * len(letters), [pacer] * len(letters))
+        for letter, schools in zip(letters, results):
+            print(f"Searching for schools starting with '{letter}'...", end=" ")
 
-        # Add to dict (deduplicates by ID)
-        for school in or_schools:
-            school_info = extract_school_info(school)
-            school_id = school_info["id"]
-            if school_id and school_id not in oregon_schools:
-                oregon_schools[school_id] = school_info
+            or_schools = filter_oregon_schools(schools)
 
-        print(f"Found {len(or_schools)} OR schools (total unique: {len(oregon_schools)})")
+            # Add to dict (deduplicates by ID)
+            for school in or_schools:
+                school_info = extract_school_info(school)
+                school_id = school_info["id"]
+                if school_id and school_id not in oregon_schools:
+                    oregon_schools[school_id] = school_info
 
-        # Add delay between requests to avoid rate limiting
-        time.sleep(1)
+            print(f"Found {len(or_schools)} OR schools (total unique: {len(oregon_schools)})")
 
     print("-" * 50)
     print(f"Total unique Oregon schools found: {len(oregon_schools)}")
@@ -108,11 +165,11 @@ def main():
     # Write to CSV
     if oregon_schools:
         with open(OUTPUT_FILE, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=["id", "name", "city"])
-            writer.writeheader()
+            writer = csv.writer(f)
+            writer.writerow(("id", "name", "city"))
             # Sort by name for easier reading
             sorted_schools = sorted(oregon_schools.values(), key=lambda x: x["name"])
-            writer.writerows(sorted_schools)
+            writer.writerows((s["id"], s["name"], s["city"]) for s in sorted_schools)
 
         print(f"Saved {len(oregon_schools)} schools to {OUTPUT_FILE}")
     else:
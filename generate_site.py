@@ -12,15 +12,26 @@ Features:
 """
 
 import os
+import gc
+import re
+import heapq
 import json
+import pickle
 import csv
 import time
-from collections import defaultdict
+from collections import defaultdict, namedtuple
+from contextlib import contextmanager
 from datetime import date
 from pathlib import Path
+import numpy as np
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderServiceError
 
+try:
+    import orjson
+except ImportError:  # optional: load_json falls back to the stdlib
+    orjson = None
+
 # Flight weights for ranking calculation
 FLIGHT_WEIGHTS = {
     ('Singles', '1'): 1.00,
@@ -475,14 +486,67 @@ def get_meet_result(meet, school_id, for_h2h=False):
     return 'tie'
 
 
+# A dual meet as seen by one school: its single winner and loser ids, and
+# the school's result in it (get_meet_result; None if it didn't play).
+DualMeet = namedtuple('DualMeet', 'meet winner_id loser_id result')
+
+
+def preprocess_meet(meet, school_id):
+    """Return a DualMeet for a dual match, or None for anything else.
+
+    is_dual_match, the winners/losers lookups and get_meet_result run once
+    here, so the record, league, FWS and results passes in build_rankings
+    all read the same small tuple instead of each re-walking the meet.
+
+    Each copy of a meet is classified on its own: the copies in the two
+    schools' files can differ, and one with an empty winners or losers list
+    is not a dual even when the other copy is.
+    """
+    if not is_dual_match(meet):
+        return None
+    schools = meet['schools']
+    return DualMeet(meet, schools['winners'][0].get('id'), schools['losers'][0].get('id'),
+                    get_meet_result(meet, school_id))
+
+
+def preprocess_meets(meets, school_id):
+    """The dual matches among `meets`, each as a DualMeet (see preprocess_meet)."""
+    return [d for d in (preprocess_meet(meet, school_id) for meet in meets) if d]
+
+
+def _first_opponent(dual, school_id):
+    """The winner, else the loser, that isn't `school_id` (None if neither)."""
+    if dual.winner_id is not None and dual.winner_id != school_id:
+        return dual.winner_id
+    if dual.loser_id is not None and dual.loser_id != school_id:
+        return dual.loser_id
+    return None
+
+
+def _last_opponent(dual, school_id):
+    """The loser, else the winner, that isn't `school_id` (None if neither)."""
+    if dual.loser_id != school_id:
+        return dual.loser_id
+    if dual.winner_id != school_id:
+        return dual.winner_id
+    return None
+
+
 def get_flight_weight(match_type, flight):
     """Get the weight for a given match type and flight."""
     return FLIGHT_WEIGHTS.get((match_type, str(flight)), 0.10)
 
 
+# FLIGHT_WEIGHTS split by match type. The per-flight loops pick their
+# type's table once and look each flight up in it directly.
+_WEIGHTS_BY_TYPE = {
+    match_type: {flight: w for (t, flight), w in FLIGHT_WEIGHTS.items() if t == match_type}
+    for match_type in ('Singles', 'Doubles')
+}
+
+
 def extract_match_results(meet, school_id):
     """Extract individual match results from a meet."""
-    results = []
     schools = meet.get('schools', {})
     winners = schools.get('winners', [])
     losers = schools.get('losers', [])
@@ -495,22 +559,28 @@ def extract_match_results(meet, school_id):
         if l['id'] != school_id:
             opponent_id = l['id']
 
+    return _flight_results(meet, school_id, opponent_id)
+
+
+def _flight_results(meet, school_id, opponent_id):
+    """The flights `school_id` played in `meet`, tagged with `opponent_id`."""
+    results = []
     if opponent_id is None:
         return results
 
     matches = meet.get('matches', {})
     for match_type in ['Singles', 'Doubles']:
+        type_weights = _WEIGHTS_BY_TYPE[match_type]
         type_matches = matches.get(match_type, [])
         if isinstance(type_matches, list):
             for match in type_matches:
                 flight = match.get('flight', '1')
-                weight = get_flight_weight(match_type, flight)
+                weight = type_weights.get(str(flight), 0.10)
                 match_teams = match.get('matchTeams', [])
                 is_win = False
                 played = False
                 for team in match_teams:
-                    players = team.get('players', [])
-                    for player in players:
+                    for player in team.get('players', []):
                         if player.get('schoolId') == school_id:
                             played = True
                             is_win = team.get('isWinner', False)
@@ -524,90 +594,25 @@ def extract_match_results(meet, school_id):
 
 def get_dual_match_record(meets, school_id):
     """Get the dual match win-loss-tie record for a school."""
-    wins = 0
-    losses = 0
-    ties = 0
-
-    for meet in meets:
-        if not is_dual_match(meet):
-            continue
-
-        result = get_meet_result(meet, school_id)
-        if result == 'win':
-            wins += 1
-        elif result == 'loss':
-            losses += 1
-        elif result == 'tie':
-            ties += 1
-
-    return wins, losses, ties
+    return collect_school(preprocess_meets(meets, school_id), school_id)[2]
 
 
 def get_dual_match_results(meets, school_id):
     """Return per-dual-match (opponent_id, 'W'|'L'|'T') records for QWS."""
-    records = []
-    for meet in meets:
-        if not is_dual_match(meet):
-            continue
-
-        result = get_meet_result(meet, school_id)
-        if result is None:
-            continue
-
-        opp_id = None
-        for side in ('winners', 'losers'):
-            for s in meet.get('schools', {}).get(side, []) or []:
-                sid = s.get('id')
-                if sid is not None and sid != school_id:
-                    opp_id = sid
-                    break
-            if opp_id is not None:
-                break
-
-        outcome = {'win': 'W', 'loss': 'L', 'tie': 'T'}.get(result)
-        if outcome is not None:
-            records.append((opp_id, outcome))
-    return records
+    return collect_school(preprocess_meets(meets, school_id), school_id)[4]
 
 
 def get_league_record(meets, school_id, school_league, school_info):
     """Get the league-only win-loss-tie record."""
-    wins = 0
-    losses = 0
-    ties = 0
-
     if not school_league:
-        return wins, losses, ties
-
-    for meet in meets:
-        if not is_dual_match(meet):
-            continue
-
-        schools = meet.get('schools', {})
-        winners = schools.get('winners', [])
-        losers = schools.get('losers', [])
-
-        opponent_id = None
-        for w in winners:
-            if w['id'] != school_id:
-                opponent_id = w['id']
-        for l in losers:
-            if l['id'] != school_id:
-                opponent_id = l['id']
+        return 0, 0, 0
+    return collect_school(preprocess_meets(meets, school_id), school_id, school_league,
+                          leagues_by_id(school_info))[3]
 
-        # Check if opponent is in same league
-        if opponent_id and opponent_id in school_info:
-            opponent_league = school_info[opponent_id].get('league', '')
-            if opponent_league == school_league:
-                result = get_meet_result(meet, school_id)
-                if result == 'win':
-                    wins += 1
-                elif result == 'loss':
-                    losses += 1
-                elif result == 'tie':
-                    ties += 1
 
-    return wins, losses, ties
+def leagues_by_id(school_info):
+    """school_id -> league ('' if none) from load_master_school_list's map."""
+    return {sid: info.get('league', '') for sid, info in school_info.items()}
 
 
 def get_head_to_head(school1_meets, school1_id, school2_id):
@@ -686,11 +691,12 @@ def get_head_to_head_detailed(school1_meets, school1_id, school2_id):
             fws2 = 0.0
             matches_data = meet.get('matches', {})
             for match_type in ['Singles', 'Doubles']:
+                type_weights = _WEIGHTS_BY_TYPE[match_type]
                 type_matches = matches_data.get(match_type, [])
                 if isinstance(type_matches, list):
                     for match in type_matches:
                         flight = match.get('flight', '1')
-                        weight = get_flight_weight(match_type, flight)
+                        weight = type_weights.get(str(flight), 0.10)
                         match_teams = match.get('matchTeams', [])
                         for team in match_teams:
                             if team.get('isWinner', False):
@@ -726,41 +732,92 @@ def get_head_to_head_detailed(school1_meets, school1_id, school2_id):
     return results
 
 
+def meets_by_opponent(duals, school_id):
+    """Group a school's dual meets by the other school in them.
+
+    get_head_to_head_detailed only counts the meets that include both
+    schools, so passing it one opponent's list gives the same answer as
+    passing every meet, without scanning the rest for each pair.
+    """
+    by_opponent = defaultdict(list)
+    for dual in duals:
+        ids = (dual.winner_id, dual.loser_id) if dual.winner_id != dual.loser_id else (dual.winner_id,)
+        for sid in ids:
+            if sid != school_id:
+                by_opponent[sid].append(dual.meet)
+    return dict(by_opponent)
+
+
 def process_school_data(data, school_id):
     """Process all meets for a school and extract match results."""
+    return collect_school(preprocess_meets(data.get('meets', []), school_id), school_id)[:2]
+
+
+_OUTCOME = {'win': 'W', 'loss': 'L', 'tie': 'T'}
+
+
+def collect_school(duals, school_id, school_league='', league_by_id=None):
+    """Everything build_rankings reads off a school's duals, in one pass.
+
+    Returns (results, opponents, record, league_record, match_results):
+    process_school_data's flight results and opponent set, the (wins,
+    losses, ties) of get_dual_match_record and get_league_record, and
+    get_dual_match_results' per-dual (opp_id, W|L|T) records. League games
+    are the duals against a school whose league in `league_by_id` (see
+    leagues_by_id) is `school_league`; with no league there are none.
+    """
     all_results = []
     opponents = set()
-    for meet in data.get('meets', []):
-        if is_dual_match(meet):
-            results = extract_match_results(meet, school_id)
-            all_results.extend(results)
-            for r in results:
-                opponents.add(r[0])
-            # Even if all individual flights are forfeited/defaulted (empty players),
-            # still record the opponent from the meet's school structure so that
-            # RPI calculations include this school's opponents.
-            if not results:
-                schools = meet.get('schools', {})
-                for w in schools.get('winners', []):
-                    if w['id'] != school_id:
-                        opponents.add(w['id'])
-                for l in schools.get('losers', []):
-                    if l['id'] != school_id:
-                        opponents.add(l['id'])
-    return all_results, opponents
+    record = {'win': 0, 'loss': 0, 'tie': 0}
+    league = {'win': 0, 'loss': 0, 'tie': 0}
+    match_results = []
+    for dual in duals:
+        opponent_id = _last_opponent(dual, school_id)
+        results = _flight_results(dual.meet, school_id, opponent_id)
+        all_results.extend(results)
+        for r in results:
+            opponents.add(r[0])
+        # Even if all individual flights are forfeited/defaulted (empty players),
+        # still record the opponent from the meet's school structure so that
+        # RPI calculations include this school's opponents.
+        if not results:
+            for sid in (dual.winner_id, dual.loser_id):
+                if sid != school_id:
+                    opponents.add(sid)
+
+        result = dual.result
+        if result is None:
+            continue
+        record[result] += 1
+        match_results.append((_first_opponent(dual, school_id), _OUTCOME[result]))
+        # Check if opponent is in same league
+        if school_league and opponent_id and league_by_id.get(opponent_id, '') == school_league:
+            league[result] += 1
+
+    return (all_results, opponents,
+            (record['win'], record['loss'], record['tie']),
+            (league['win'], league['loss'], league['tie']),
+            match_results)
 
 
 def calculate_wwp(results):
     """Calculate Weighted Win Percentage from match results."""
-    if not results:
-        return 0.0
-    weighted_wins = sum(r[4] for r in results if r[3])
-    weighted_total = sum(r[4] for r in results)
+    weighted_wins = weighted_total = 0
+    for r in results:  # one pass, both totals
+        weighted_total += r[4]
+        if r[3]:
+            weighted_wins += r[4]
     if weighted_total == 0:
         return 0.0
     return weighted_wins / weighted_total
 
 
+def _is_tiebreak_score(set_scores):
+    """True if a set's scores look like a match tiebreak (one side at 10+)."""
+    vals = [v for k, v in set_scores.items() if isinstance(v, int) and k not in ('number', 'tie')]
+    return len(vals) >= 2 and max(vals) >= 10
+
+
 def calculate_fws_per_match(data, school_id):
     """
     Calculate Flight Weighted Score (FWS) per dual match using Proportional Weighting.
@@ -786,6 +843,11 @@ def calculate_fws_per_match(data, school_id):
     - game_share: aggregate games_won / games_played
     - game_share_match_records: list of (opponent_id, match_game_share) for oGS reweighting
     """
+    return fws_per_match(preprocess_meets(data.get('meets', []), school_id), school_id)
+
+
+def fws_per_match(duals, school_id):
+    """calculate_fws_per_match over preprocessed dual meets."""
     dual_match_fws_scores = []
     per_match_records = []  # [(opp_id, match_fws), ...]
     game_share_records = []  # [(opp_id, match_game_share), ...]
@@ -807,20 +869,11 @@ def calculate_fws_per_match(data, school_id):
     total_flights_won = 0
     total_flights_played = 0
 
-    for meet in data.get('meets', []):
-        if not is_dual_match(meet):
-            continue
+    for dual in duals:
+        meet = dual.meet
 
         # Identify the opponent for this dual (needed for TOSS per-match records)
-        opp_id = None
-        for side in ('winners', 'losers'):
-            for s in meet.get('schools', {}).get(side, []) or []:
-                sid = s.get('id')
-                if sid is not None and sid != school_id:
-                    opp_id = sid
-                    break
-            if opp_id is not None:
-                break
+        opp_id = _first_opponent(dual, school_id)
 
         # Track points earned and available weight for this match
         points_earned = 0.0
@@ -830,11 +883,12 @@ def calculate_fws_per_match(data, school_id):
         matches = meet.get('matches', {})
 
         for match_type in ['Singles', 'Doubles']:
+            type_weights = _WEIGHTS_BY_TYPE[match_type]
             type_matches = matches.get(match_type, [])
             if isinstance(type_matches, list):
                 for match in type_matches:
                     flight = match.get('flight', '1')
-                    weight = get_flight_weight(match_type, flight)
+                    weight = type_weights.get(str(flight), 0.10)
                     match_teams = match.get('matchTeams', [])
 
                     # Flight key for breakdown (S1, S2, D1, D2, etc.)
@@ -846,47 +900,55 @@ def calculate_fws_per_match(data, school_id):
                     if flight_contested:
                         available_weight += weight
                         total_flights_played += 1
-                        if flight_key in flight_stats:
-                            flight_stats[flight_key]['played'] += 1
+                        stats = flight_stats.get(flight_key)
+                        if stats is not None:
+                            stats['played'] += 1
 
                         # Identify our team and opponent's team in this flight
                         my_tid = opp_tid = None
                         my_won = False
                         for team in match_teams:
-                            players = team.get('players', [])
-                            for player in players:
+                            tid = team.get('id')
+                            for player in team.get('players', []):
                                 if player.get('schoolId') == school_id:
-                                    my_tid = team.get('id')
+                                    my_tid = tid
                                     my_won = bool(team.get('isWinner', False))
                                     break
                             if my_tid is None:
-                                opp_tid = team.get('id')
+                                opp_tid = tid
                         # opp_tid may be set in either order; recover if missed
                         if opp_tid is None:
                             for team in match_teams:
-                                if team.get('id') != my_tid:
-                                    opp_tid = team.get('id')
+                                tid = team.get('id')
+                                if tid != my_tid:
+                                    opp_tid = tid
                                     break
 
                         if my_won:
                             points_earned += weight
                             total_flights_won += 1
-                            if flight_key in flight_stats:
-                                flight_stats[flight_key]['wins'] += 1
+                            if stats is not None:
+                                stats['wins'] += 1
 
                         # Game-share accounting (informational + oGS input).
                         # Match tiebreakers (super-TB, set 3 with one side ≥10)
                         # count as 1 game to the winner, not their raw points,
                         # since 10-7 is a single decision, not 17 games.
                         if my_tid is not None and opp_tid is not None:
+                            my_key, opp_key = str(my_tid), str(opp_tid)
                             for s in match.get('sets') or []:
                                 n = s.get('number') or 0
-                                mg = s.get(str(my_tid)) if s.get(str(my_tid)) is not None else s.get(my_tid)
-                                og = s.get(str(opp_tid)) if s.get(str(opp_tid)) is not None else s.get(opp_tid)
+                                mg = s.get(my_key)
+                                if mg is None:
+                                    mg = s.get(my_tid)
+                                og = s.get(opp_key)
+                                if og is None:
+                                    og = s.get(opp_tid)
                                 if not isinstance(mg, int) or not isinstance(og, int):
                                     continue
-                                vals = [v for k, v in s.items() if isinstance(v, int) and k not in ('number', 'tie')]
-                                is_match_tb = (n >= 3) and len(vals) >= 2 and max(vals) >= 10
+                                # Only a third set can be a match tiebreak, so
+                                # only it needs the scan of every score.
+                                is_match_tb = n >= 3 and _is_tiebreak_score(s)
                                 if is_match_tb:
                                     if mg > og:
                                         match_games_won += 1
@@ -946,55 +1008,164 @@ def calculate_fws_per_match(data, school_id):
     }
 
 
-def build_rankings(data_dir, master_school_list):
-    """Build rankings for all schools across all years and genders."""
+def _opponent_edges(teams):
+    """One (school, opponent) edge per entry in each school's opponents set.
+
+    `teams` maps school_id -> stats for one (year, gender). Returns the
+    source and destination indices into `teams` as arrays, in set order;
+    opponents outside the group (e.g., Idaho schools) get destination -1.
+    """
+    index = {sid: i for i, sid in enumerate(teams)}
+    src, dst = [], []
+    for i, school in enumerate(teams.values()):
+        for opp_id in school['opponents']:
+            src.append(i)
+            dst.append(index.get(opp_id, -1))
+    return np.array(src, dtype=np.intp), np.array(dst, dtype=np.intp)
+
+
+def _opponent_mean(src, dst, values, scale=None):
+    """Average `values` over each school's opponents (see _opponent_edges).
+
+    Unknown opponents count as a neutral 0.5, and a school with no opponents
+    gets 0.5. `scale`, if given, multiplies each known opponent's value.
+    bincount adds in edge order, so each mean is the same float the
+    per-school sum() / len() gives.
+    """
+    per_edge = values[dst] if scale is None else values[dst] * scale
+    per_edge = np.where(dst >= 0, per_edge, 0.5)
+    total = np.bincount(src, weights=per_edge, minlength=len(values))
+    count = np.bincount(src, minlength=len(values))
+    return np.divide(total, count, out=np.full(len(values), 0.5), where=count > 0)
+
+
+@contextmanager
+def _gc_paused():
+    """Hold off the cyclic GC while large, acyclic data is built.
+
+    Loading the school files allocates millions of dicts and lists, and each
+    burst of allocations sets off a collection that walks everything loaded
+    so far, only to find no cycles. Usable as a decorator.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+# school_74814_gender_1.json
+_SCHOOL_FILE = re.compile(r'school_(\d+)_gender_(\d+)\.json')
+
+
+def school_files(year_dir):
+    """The season's school files as (DirEntry, school_id, gender_id), by name.
+
+    One os.scandir pass: the names are parsed here, and each entry's stat
+    is the one the parse cache keys on.
+    """
+    with os.scandir(year_dir) as it:
+        files = []
+        for entry in it:
+            m = _SCHOOL_FILE.fullmatch(entry.name)
+            if m:
+                files.append((entry, int(m[1]), int(m[2])))
+    files.sort(key=lambda f: f[0].name)
+    return files
+
+
+def load_json(path):
+    """Parse a JSON file, with orjson when it is installed.
+
+    orjson rejects a few things the stdlib reads (NaN, integers past 64
+    bits); a file with any of them goes through json.load instead.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(Path(path).read_bytes())
+        except orjson.JSONDecodeError:
+            pass
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def load_parse_cache(cache_file):
+    """The parsed school files saved by save_parse_cache, as
+    {path: ((mtime_ns, size), doc)}, or {} if there are none."""
+    try:
+        with _gc_paused(), open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        return {}
+
+
+def save_parse_cache(cache_file, entries):
+    with open(cache_file, 'wb') as f:
+        pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+@_gc_paused()
+def build_rankings(data_dir, master_school_list, parse_cache=None):
+    """Build rankings for all schools across all years and genders.
+
+    Runs with the cyclic GC paused (see _gc_paused); any cycles left behind
+    are collected once it resumes.
+
+    With `parse_cache`, a file path, each school file's parsed JSON is kept
+    there between runs and reused while the file's mtime and size are
+    unchanged, so only files that changed are parsed again.
+    """
     school_info = load_master_school_list(master_school_list)
+    league_by_id = leagues_by_id(school_info)
+    cached = load_parse_cache(parse_cache) if parse_cache else {}
+    parsed = {}
+    reparsed = 0
     school_data = defaultdict(lambda: defaultdict(dict))
-    raw_data_cache = defaultdict(lambda: defaultdict(dict))
+    # (year, gender, school_id) -> opponent -> meets, for every school file
+    # loaded; the head-to-head checks read only these, not the documents.
+    h2h_meets = {}
 
-    data_path = Path(data_dir)
+    with os.scandir(data_dir) as it:
+        year_dirs = sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
 
-    for year_dir in sorted(data_path.iterdir()):
-        if not year_dir.is_dir():
-            continue
+    for year_dir in year_dirs:
         year = year_dir.name
         if not year.isdigit() or int(year) < 2021 or int(year) > 2027:
             continue
 
         print(f"Processing year {year}...")
 
-        # Sorted: glob() returns directory order, which differs between a local
+        # Sorted: scandir() returns directory order, which differs between a local
         # checkout and the Actions runner. Ranked teams are emitted in rank order
         # regardless, but unranked (NR) teams are appended as encountered, so an
-        # unsorted glob made processed_rankings.json churn between machines with
+        # unsorted listing made processed_rankings.json churn between machines with
         # no change in any value.
-        for json_file in sorted(year_dir.glob('school_*_gender_*.json')):
-            parts = json_file.stem.split('_')
-            school_id = int(parts[1])
-            gender_id = int(parts[3])
+        for json_file, school_id, gender_id in school_files(year_dir):
             gender = GENDER_MAP.get(gender_id, 'Unknown')
 
-            with open(json_file, 'r') as f:
-                data = json.load(f)
-
-            data['meets'] = dedupe_meets(data.get('meets', []))
-            raw_data_cache[year][gender][school_id] = data
-            results, opponents = process_school_data(data, school_id)
-            wins, losses, ties = get_dual_match_record(data.get('meets', []), school_id)
-
-            # Get league record
-            info = school_info.get(school_id, {})
-            school_league = info.get('league', '')
-            league_wins, league_losses, league_ties = get_league_record(
-                data.get('meets', []), school_id, school_league, school_info
-            )
+            stat = json_file.stat()
+            key = (stat.st_mtime_ns, stat.st_size)
+            hit = cached.get(json_file.path)
+            if hit is not None and hit[0] == key:
+                data = hit[1]
+            else:
+                data = load_json(json_file.path)
+                reparsed += 1
+            parsed[json_file.path] = (key, data)
+
+            # Each dual is parsed once; every pass below reads the DualMeets.
+            duals = preprocess_meets(dedupe_meets(data.get('meets', [])), school_id)
+            h2h_meets[(year, gender, school_id)] = meets_by_opponent(duals, school_id)
+            school_league = league_by_id.get(school_id, '')
+            (results, opponents, (wins, losses, ties),
+             (league_wins, league_losses, league_ties),
+             match_results) = collect_school(duals, school_id, school_league, league_by_id)
 
             if results or (wins + losses + ties > 0):
                 # FWS calculation returns dict with breakdown data
-                fws_data = calculate_fws_per_match(data, school_id)
-
-                # Per-dual (opp_id, W|L|T) records for QWS
-                dual_results = get_dual_match_results(data.get('meets', []), school_id)
+                fws_data = fws_per_match(duals, school_id)
 
                 # Calculate simple Win Percentage (WP) - ties count as 0.5 wins
                 total_duals = wins + losses + ties
@@ -1026,51 +1197,38 @@ def build_rankings(data_dir, master_school_list):
                     # Alt-model inputs (TOSS + QWS)
                     'fws_match_records': fws_data.get('per_match_records', []),
                     'game_share_match_records': fws_data.get('game_share_match_records', []),
-                    'dual_match_results': dual_results,
+                    'dual_match_results': match_results,
                 }
 
-    # Calculate OWP (Opponent Win Percentage) - based on simple WP
-    for year in school_data:
-        for gender in school_data[year]:
-            for school_id in school_data[year][gender]:
-                school = school_data[year][gender][school_id]
-                opponents = school['opponents']
-
-                opponent_wps = []
-                for opp_id in opponents:
-                    if opp_id in school_data[year][gender]:
-                        opponent_wps.append(school_data[year][gender][opp_id]['wp'])
-                    else:
-                        # Unknown opponents (e.g., Idaho schools) rated as neutral average
-                        opponent_wps.append(0.5)
-
-                owp = sum(opponent_wps) / len(opponent_wps) if opponent_wps else 0.5
-                school['owp'] = owp
+    if parse_cache and (reparsed or len(parsed) != len(cached)):
+        save_parse_cache(parse_cache, parsed)
 
-    # Calculate OOWP (Opponent's Opponent Win Percentage) and final APR
+    # Opponent edges per (year, gender) group, built once and reused by
+    # every OWP/OOWP pass below (see _opponent_edges).
+    group_edges = {}
     for year in school_data:
-        for gender in school_data[year]:
-            for school_id in school_data[year][gender]:
-                school = school_data[year][gender][school_id]
-                opponents = school['opponents']
-
-                # OOWP = average of all opponents' OWP values
-                opponent_owps = []
-                for opp_id in opponents:
-                    if opp_id in school_data[year][gender]:
-                        opponent_owps.append(school_data[year][gender][opp_id]['owp'])
-                    else:
-                        # Unknown opponents rated as neutral average
-                        opponent_owps.append(0.5)
+        for gender, teams in school_data[year].items():
+            group_edges[(year, gender)] = _opponent_edges(teams)
+
+    # Calculate OWP (Opponent Win Percentage) - based on simple WP, then
+    # OOWP (Opponent's Opponent Win Percentage) = average of opponents' OWP,
+    # and the final APR and Power Index.
+    for (year, gender), (src, dst) in group_edges.items():
+        teams = school_data[year][gender]
+        wp = np.array([school['wp'] for school in teams.values()])
+        normalized_fws = np.array([school['normalized_fws'] for school in teams.values()])
+        owp = _opponent_mean(src, dst, wp)
+        oowp = _opponent_mean(src, dst, owp)
 
-                oowp = sum(opponent_owps) / len(opponent_owps) if opponent_owps else 0.5
-                school['oowp'] = oowp
+        # APR = Standard RPI formula: (WP * 0.25) + (OWP * 0.50) + (OOWP * 0.25)
+        apr = (wp * WP_WEIGHT) + (owp * OWP_WEIGHT) + (oowp * OOWP_WEIGHT)
 
-                # APR = Standard RPI formula: (WP * 0.25) + (OWP * 0.50) + (OOWP * 0.25)
-                school['apr'] = (school['wp'] * WP_WEIGHT) + (school['owp'] * OWP_WEIGHT) + (oowp * OOWP_WEIGHT)
+        # Power Index = 50/50 split between Results (APR) and Depth (FWS)
+        power_index = (apr * APR_WEIGHT) + (normalized_fws * FWS_WEIGHT)
 
-                # Power Index = 50/50 split between Results (APR) and Depth (FWS)
-                school['power_index'] = (school['apr'] * APR_WEIGHT) + (school['normalized_fws'] * FWS_WEIGHT)
+        for school, *values in zip(teams.values(), owp.tolist(), oowp.tolist(),
+                                   apr.tolist(), power_index.tolist()):
+            school['owp'], school['oowp'], school['apr'], school['power_index'] = values
 
     # --- Pass 2: league-depth-weighted OWP ---
     # Reweight each opponent's contribution to OWP by the depth of their league.
@@ -1083,7 +1241,7 @@ def build_rankings(data_dir, master_school_list):
     for year in school_data:
         for gender in school_data[year]:
             for sid, school in school_data[year][gender].items():
-                league = school_info.get(sid, {}).get('league', '')
+                league = league_by_id.get(sid, '')
                 if league:
                     league_aprs[(year, gender, league)].append((school['apr'], sid))
 
@@ -1104,38 +1262,30 @@ def build_rankings(data_dir, master_school_list):
         top = filtered[:LEAGUE_DEPTH_TOP_N]
         return sum(top) / len(top) if top else median_depth.get((year, gender), 0.5)
 
-    # Recompute OWP with league-depth-weighted opponent strengths
-    for year in school_data:
-        for gender in school_data[year]:
-            med = median_depth.get((year, gender), 0.5) or 0.5
-            for school_id, school in school_data[year][gender].items():
-                eff_strengths = []
-                for opp_id in school['opponents']:
-                    if opp_id in school_data[year][gender]:
-                        opp = school_data[year][gender][opp_id]
-                        opp_league = school_info.get(opp_id, {}).get('league', '')
-                        if opp_league:
-                            d = loo_depth(year, gender, opp_league, {opp_id, school_id})
-                            eff_strengths.append(opp['wp'] * (d / med))
-                        else:
-                            eff_strengths.append(opp['wp'])
-                    else:
-                        eff_strengths.append(0.5)
-                school['owp'] = sum(eff_strengths) / len(eff_strengths) if eff_strengths else 0.5
-
-    # Recompute OOWP, APR, PI from pass-2 OWPs
-    for year in school_data:
-        for gender in school_data[year]:
-            for school_id, school in school_data[year][gender].items():
-                opponent_owps = []
-                for opp_id in school['opponents']:
-                    if opp_id in school_data[year][gender]:
-                        opponent_owps.append(school_data[year][gender][opp_id]['owp'])
-                    else:
-                        opponent_owps.append(0.5)
-                school['oowp'] = sum(opponent_owps) / len(opponent_owps) if opponent_owps else 0.5
-                school['apr'] = (school['wp'] * WP_WEIGHT) + (school['owp'] * OWP_WEIGHT) + (school['oowp'] * OOWP_WEIGHT)
-                school['power_index'] = (school['apr'] * APR_WEIGHT) + (school['normalized_fws'] * FWS_WEIGHT)
+    # Recompute OWP with league-depth-weighted opponent strengths, then
+    # OOWP, APR, PI from pass-2 OWPs
+    for (year, gender), (src, dst) in group_edges.items():
+        teams = school_data[year][gender]
+        ids = list(teams)
+        med = median_depth.get((year, gender), 0.5) or 0.5
+        scale = np.ones(len(src))
+        for e, (i, j) in enumerate(zip(src.tolist(), dst.tolist())):
+            if j >= 0:
+                opp_league = league_by_id.get(ids[j], '')
+                if opp_league:
+                    d = loo_depth(year, gender, opp_league, {ids[j], ids[i]})
+                    scale[e] = d / med
+
+        wp = np.array([school['wp'] for school in teams.values()])
+        normalized_fws = np.array([school['normalized_fws'] for school in teams.values()])
+        owp = _opponent_mean(src, dst, wp, scale)
+        oowp = _opponent_mean(src, dst, owp)
+        apr = (wp * WP_WEIGHT) + (owp * OWP_WEIGHT) + (oowp * OOWP_WEIGHT)
+        power_index = (apr * APR_WEIGHT) + (normalized_fws * FWS_WEIGHT)
+
+        for school, *values in zip(teams.values(), owp.tolist(), oowp.tolist(),
+                                   apr.tolist(), power_index.tolist()):
+            school['owp'], school['oowp'], school['apr'], school['power_index'] = values
 
     # --- Alt-model A/B test: TOSS + QWS ---
     # Only compute on/after ADJUSTED_FWS_EFFECTIVE_DATE (or when overridden by
@@ -1400,17 +1550,17 @@ def build_rankings(data_dir, master_school_list):
                 # Get all H2H results within this league
                 league_h2h = {}  # {(winner_id, loser_id): (wins, losses)}
                 for school_id, state_rank, stats in teams:
-                    if school_id not in raw_data_cache[year][gender]:
+                    school_meets = h2h_meets.get((year, gender, school_id))
+                    if school_meets is None:
                         continue
-                    school_meets = raw_data_cache[year][gender][school_id].get('meets', [])
 
                     for other_id, other_rank, other_stats in teams:
                         if school_id == other_id:
                             continue
-                        if other_id not in raw_data_cache[year][gender]:
+                        if (year, gender, other_id) not in h2h_meets:
                             continue
 
-                        h2h_detail = get_head_to_head_detailed(school_meets, school_id, other_id)
+                        h2h_detail = get_head_to_head_detailed(school_meets.get(other_id, ()), school_id, other_id)
                         if h2h_detail['wins'] > 0 or h2h_detail['losses'] > 0:
                             league_h2h[(school_id, other_id)] = (h2h_detail['wins'], h2h_detail['losses'])
 
@@ -1474,8 +1624,8 @@ def build_rankings(data_dir, master_school_list):
 
                 if condition_a or condition_b:
                     # Check H2H - does lower-ranked team (school2) beat higher-ranked (school1)?
-                    if school1_id in raw_data_cache[year][gender] and school2_id in raw_data_cache[year][gender]:
-                        school2_meets = raw_data_cache[year][gender][school2_id].get('meets', [])
+                    if (year, gender, school1_id) in h2h_meets and (year, gender, school2_id) in h2h_meets:
+                        school2_meets = h2h_meets[(year, gender, school2_id)].get(school1_id, ())
                         h2h_detail = get_head_to_head_detailed(school2_meets, school2_id, school1_id)
                         h2h_wins = h2h_detail['wins']
                         h2h_losses = h2h_detail['losses']
@@ -1540,14 +1690,14 @@ def build_rankings(data_dir, master_school_list):
 
                 # Check H2H for teams within class rank or PI proximity
                 for school_id, state_pos, stats in teams:
-                    if school_id not in raw_data_cache[year][gender]:
+                    school_meets = h2h_meets.get((year, gender, school_id))
+                    if school_meets is None:
                         continue
-                    school_meets = raw_data_cache[year][gender][school_id].get('meets', [])
 
                     for other_id, other_pos, other_stats in teams:
                         if school_id == other_id:
                             continue
-                        if other_id not in raw_data_cache[year][gender]:
+                        if (year, gender, other_id) not in h2h_meets:
                             continue
 
                         # Skip if already swapped by Phase 1 or 2
@@ -1570,7 +1720,7 @@ def build_rankings(data_dir, master_school_list):
                         if not (within_class_threshold or within_pi_threshold):
                             continue
 
-                        h2h_detail = get_head_to_head_detailed(school_meets, school_id, other_id)
+                        h2h_detail = get_head_to_head_detailed(school_meets.get(other_id, ()), school_id, other_id)
                         h2h_wins = h2h_detail['wins']
                         h2h_losses = h2h_detail['losses']
 
@@ -1622,7 +1772,7 @@ def build_rankings(data_dir, master_school_list):
             school_league_rank = {}
             post_swap_league_groups = defaultdict(list)
             for school_id, stats in ranked:
-                league = school_info.get(school_id, {}).get('league', '')
+                league = league_by_id.get(school_id, '')
                 if league:
                     post_swap_league_groups[league].append(school_id)
             for league, ids in post_swap_league_groups.items():
@@ -1656,9 +1806,9 @@ def build_rankings(data_dir, master_school_list):
                             league_close = True
 
                     if state_rank_close or league_close:
-                        if school_id in raw_data_cache[year][gender]:
-                            school_meets = raw_data_cache[year][gender][school_id].get('meets', [])
-                            h2h_detail = get_head_to_head_detailed(school_meets, school_id, other_id)
+                        if (year, gender, school_id) in h2h_meets:
+                            pair_meets = h2h_meets[(year, gender, school_id)].get(other_id, ())
+                            h2h_detail = get_head_to_head_detailed(pair_meets, school_id, other_id)
                             wins = h2h_detail['wins']
                             losses = h2h_detail['losses']
                             ties = h2h_detail['ties']
@@ -1902,52 +2052,65 @@ def build_rankings(data_dir, master_school_list):
                     e['class_rank_qws'] = None
                     e['class_rank_legacy'] = None
 
-    return output, school_data, raw_data_cache, school_info
+    return output, school_data, h2h_meets, school_info
 
 
 def calculate_league_power_scores(rankings):
     """Calculate Conference Power Score and Depth Score for each league."""
-    from collections import defaultdict
-
-    # Group by year, gender, league
-    league_data = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
+    # Group by year, gender, league. Rankings come grouped by year and
+    # gender, so first-seen key order is the order nested dicts would give.
+    league_data = defaultdict(list)
 
     for r in rankings:
         if r['league']:
-            league_data[r['year']][r['gender']][r['league']].append(r)
+            league_data[(r['year'], r['gender'], r['league'])].append(r)
 
     league_scores = []
-    for year in league_data:
-        for gender in league_data[year]:
-            for league, teams in league_data[year][gender].items():
-                if not teams:
-                    continue
+    for (year, gender, league), teams in league_data.items():
+        # Avg APR of all teams
+        avg_apr = sum(t['apr'] for t in teams) / len(teams)
+
+        # Top 4 depth score. Only the top four are ever read, so they are
+        # picked without sorting the league (nlargest keeps sorted()'s order
+        # among equal APRs).
+        top_4 = heapq.nlargest(4, teams, key=lambda x: x['apr'])
+        depth_score = sum(t['apr'] for t in top_4) / len(top_4)
+
+        # Get classification from the top team
+        classification = top_4[0]['classification']
+
+        league_scores.append({
+            'year': year,
+            'gender': gender,
+            'league': league,
+            'classification': classification,
+            'avg_apr': round(avg_apr, 4),
+            'depth_score': round(depth_score, 4),
+            'num_schools': len(teams),
+            'top_team': top_4[0]['school_name'],
+        })
 
-                # Sort by APR descending
-                sorted_teams = sorted(teams, key=lambda x: x['apr'], reverse=True)
-
-                # Avg APR of all teams
-                avg_apr = sum(t['apr'] for t in sorted_teams) / len(sorted_teams)
+    return league_scores
 
-                # Top 4 depth score
-                top_4 = sorted_teams[:4]
-                depth_score = sum(t['apr'] for t in top_4) / len(top_4) if top_4 else 0
 
-                # Get classification from first team
-                classification = sorted_teams[0]['classification'] if sorted_teams else ''
+def pack_rows(rows):
+    """Pack a list of flat dicts for embedding in the page.
 
-                league_scores.append({
-                    'year': year,
-                    'gender': gender,
-                    'league': league,
-                    'classification': classification,
-                    'avg_apr': round(avg_apr, 4),
-                    'depth_score': round(depth_score, 4),
-                    'num_schools': len(sorted_teams),
-                    'top_team': sorted_teams[0]['school_name'] if sorted_teams else '',
-                })
-
-    return league_scores
+    Rows don't repeat their key names: each distinct key list is stored once
+    in `keys`, and each row becomes [index into keys, *values]. The page's
+    unpackRows turns it back into the same objects, keys in the same order.
+    """
+    shapes = {}
+    keys = []
+    packed = []
+    for row in rows:
+        shape = tuple(row)
+        i = shapes.get(shape)
+        if i is None:
+            i = shapes[shape] = len(keys)
+            keys.append(list(shape))
+        packed.append([i, *row.values()])
+    return {'keys': keys, 'rows': packed}
 
 
 def load_state_tournament_results(filepath):
@@ -1970,24 +2133,51 @@ def load_state_tournament_results(filepath):
     return results
 
 
-def generate_html(rankings, school_data, raw_data_cache, school_info, state_results):
+def generate_html(rankings, school_data, h2h_meets, school_info, state_results):
     """Generate the HTML dashboard with modern UI and playoff simulator."""
+    return ''.join(generate_html_parts(rankings, school_data, h2h_meets, school_info, state_results))
+
+
+def generate_html_parts(rankings, school_data, h2h_meets, school_info, state_results):
+    """generate_html's page as the strings that make it up, in order.
 
-    years = sorted(set(r['year'] for r in rankings), reverse=True)
-    genders = sorted(set(r['gender'] for r in rankings))
-    classifications = sorted(set(r['classification'] for r in rankings if r['classification']))
-    leagues = sorted(set(r['league'] for r in rankings if r['league']))
+    The embedded rankings literal is most of the page; keeping it a part of
+    its own lets main() write the page without first joining a second copy.
+    """
+
+    # One pass collects every filter's choices.
+    years, genders, classifications, leagues = set(), set(), set(), set()
+    for r in rankings:
+        years.add(r['year'])
+        genders.add(r['gender'])
+        classifications.add(r['classification'])
+        leagues.add(r['league'])
+    years = sorted(years, reverse=True)
+    genders = sorted(genders)
+    classifications = sorted(c for c in classifications if c)
+    leagues = sorted(l for l in leagues if l)
+
+    # The <option> lists repeat across the tabs; build each once.
+    def options(values):
+        return "\n".join(f'<option value="{v}">{v}</option>' for v in values)
+
+    year_options = options(years)
+    gender_options = options(genders)
+    class_options = options(classifications)
+    league_options = options(leagues)
     alt_models_live = any('power_index_toss' in r for r in rankings)
     toss_primary_live = _toss_is_primary()
 
     # Calculate league power scores
     league_scores = calculate_league_power_scores(rankings)
 
-    rankings_json = json.dumps(rankings)
-    league_scores_json = json.dumps(league_scores)
-    state_results_json = json.dumps(state_results)
+    # Embedded as JS literals, each packed by pack_rows; compact separators,
+    # since nothing reads the page source.
+    rankings_json = json.dumps(pack_rows(rankings), separators=(',', ':'))
+    league_scores_json = json.dumps(pack_rows(league_scores), separators=(',', ':'))
+    state_results_json = json.dumps(pack_rows(state_results), separators=(',', ':'))
 
-    html = f'''<!DOCTYPE html>
+    head = f'''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -2223,27 +2413,27 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
             <div class="filter-group">
                 <label>Year</label>
                 <select id="yearFilter" class="form-select form-select-sm">
-                    {chr(10).join(f'<option value="{y}">{y}</option>' for y in years)}
+                    {year_options}
                 </select>
             </div>
             <div class="filter-group">
                 <label>Gender</label>
                 <select id="genderFilter" class="form-select form-select-sm">
-                    {chr(10).join(f'<option value="{g}">{g}</option>' for g in genders)}
+                    {gender_options}
                 </select>
             </div>
             <div class="filter-group">
                 <label>Class</label>
                 <select id="classFilter" class="form-select form-select-sm">
                     <option value="">All</option>
-                    {chr(10).join(f'<option value="{c}">{c}</option>' for c in classifications)}
+                    {class_options}
                 </select>
             </div>
             <div class="filter-group">
                 <label>League</label>
                 <select id="leagueFilter" class="form-select form-select-sm">
                     <option value="">All</option>
-                    {chr(10).join(f'<option value="{l}">{l}</option>' for l in leagues)}
+                    {league_options}
                 </select>
             </div>
             <div class="filter-group">
@@ -2326,19 +2516,19 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                 <div class="form-group">
                     <label>Year</label>
                     <select id="playoffYear" class="form-select form-select-sm">
-                        {chr(10).join(f'<option value="{y}">{y}</option>' for y in years)}
+                        {year_options}
                     </select>
                 </div>
                 <div class="form-group">
                     <label>Gender</label>
                     <select id="playoffGender" class="form-select form-select-sm">
-                        {chr(10).join(f'<option value="{g}">{g}</option>' for g in genders)}
+                        {gender_options}
                     </select>
                 </div>
                 <div class="form-group">
                     <label>Classification</label>
                     <select id="playoffClass" class="form-select form-select-sm">
-                        {chr(10).join(f'<option value="{c}">{c}</option>' for c in classifications)}
+                        {class_options}
                     </select>
                 </div>
                 <div class="form-group">
@@ -2398,19 +2588,19 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                 <div class="form-group" style="display:inline-block; margin-right:16px;">
                     <label style="display:block; font-size:12px; font-weight:600; color:#6c757d; margin-bottom:4px;">Year</label>
                     <select id="compYear" class="form-select form-select-sm">
-                        {chr(10).join(f'<option value="{y}">{y}</option>' for y in years)}
+                        {year_options}
                     </select>
                 </div>
                 <div class="form-group" style="display:inline-block; margin-right:16px;">
                     <label style="display:block; font-size:12px; font-weight:600; color:#6c757d; margin-bottom:4px;">Gender</label>
                     <select id="compGender" class="form-select form-select-sm">
-                        {chr(10).join(f'<option value="{g}">{g}</option>' for g in genders)}
+                        {gender_options}
                     </select>
                 </div>
                 <div class="form-group" style="display:inline-block; margin-right:16px;">
                     <label style="display:block; font-size:12px; font-weight:600; color:#6c757d; margin-bottom:4px;">Classification</label>
                     <select id="compClass" class="form-select form-select-sm">
-                        {chr(10).join(f'<option value="{c}">{c}</option>' for c in classifications)}
+                        {class_options}
                     </select>
                 </div>
                 <div class="form-group" style="display:inline-block; margin-right:16px;">
@@ -2437,13 +2627,13 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                 <div class="form-group" style="display:inline-block; margin-right:16px;">
                     <label style="display:block; font-size:12px; font-weight:600; color:#6c757d; margin-bottom:4px;">Year</label>
                     <select id="analysisYear" class="form-select form-select-sm">
-                        {chr(10).join(f'<option value="{y}">{y}</option>' for y in years)}
+                        {year_options}
                     </select>
                 </div>
                 <div class="form-group" style="display:inline-block; margin-right:16px;">
                     <label style="display:block; font-size:12px; font-weight:600; color:#6c757d; margin-bottom:4px;">Gender</label>
                     <select id="analysisGender" class="form-select form-select-sm">
-                        {chr(10).join(f'<option value="{g}">{g}</option>' for g in genders)}
+                        {gender_options}
                     </select>
                 </div>
                 <div class="form-group" style="display:inline-block;">
@@ -2484,9 +2674,20 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
     <script src="https://cdn.datatables.net/1.13.7/js/dataTables.bootstrap5.min.js"></script>
 
     <script>
-        const rankings = {rankings_json};
-        const leagueScores = {league_scores_json};
-        const stateResults = {state_results_json};
+        // Rebuilds the row objects packed by pack_rows() in generate_site.py.
+        function unpackRows(packed) {{
+            return packed.rows.map(row => {{
+                const names = packed.keys[row[0]];
+                const obj = {{}};
+                for (let i = 0; i < names.length; i++) obj[names[i]] = row[i + 1];
+                return obj;
+            }});
+        }}
+        const rankings = unpackRows('''
+    # rankings_json goes between head and tail; see the return below.
+    tail = f''');
+        const leagueScores = unpackRows({league_scores_json});
+        const stateResults = unpackRows({state_results_json});
         let table;
 
         // Check for analysis view URL param
@@ -2551,8 +2752,12 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                 return (v !== undefined && v !== null) ? v : row[fallback];
             }}
 
+            // Rows stay driven by the ranking objects (the renderers, filters
+            // and model selector all read them); deferRender builds a row's
+            // <tr> only when a page first shows it.
             table = $('#rankingsTable').DataTable({{
                 data: rankings,
+                deferRender: true,
                 columns: [
                     {{
                         data: 'rank',
@@ -2729,14 +2934,21 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                 table.order([[0, 'asc']]).rows().invalidate('data').draw();
             }});
 
-            // Filtering
+            // Filtering. The filter controls are read when they change, not
+            // for every row of every draw.
+            const filters = {{}};
+            function readFilters() {{
+                filters.year = $('#yearFilter').val();
+                filters.gender = $('#genderFilter').val();
+                filters.cls = $('#classFilter').val();
+                filters.league = $('#leagueFilter').val();
+                filters.minMatches = parseInt($('#minMatchesFilter').val()) || 0;
+            }}
+
             $.fn.dataTable.ext.search.push((settings, data, idx) => {{
-                const row = table.row(idx).data();
-                const year = $('#yearFilter').val();
-                const gender = $('#genderFilter').val();
-                const cls = $('#classFilter').val();
-                const league = $('#leagueFilter').val();
-                const minMatches = parseInt($('#minMatchesFilter').val()) || 0;
+                // The table's data is rankings, never added to, so row idx is rankings[idx]
+                const row = rankings[idx];
+                const {{ year, gender, cls, league, minMatches }} = filters;
 
                 if (year && row.year != year) return false;
                 if (gender && row.gender !== gender) return false;
@@ -2747,10 +2959,23 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                 return true;
             }});
 
-            $('#yearFilter, #genderFilter, #classFilter, #leagueFilter, #minMatchesFilter').on('change', () => table.draw());
-            $('#searchBox').on('keyup', function() {{ table.search(this.value).draw(); }});
+            $('#yearFilter, #genderFilter, #classFilter, #leagueFilter, #minMatchesFilter').on('change', () => {{
+                readFilters();
+                table.draw();
+            }});
+            // A number typed but not yet committed still applies to the next
+            // draw (search box, model switch), as it did when read per row.
+            $('#minMatchesFilter').on('input', readFilters);
+            // Redraw once typing pauses, not on every keystroke
+            let searchTimer;
+            $('#searchBox').on('keyup', function() {{
+                const value = this.value;
+                clearTimeout(searchTimer);
+                searchTimer = setTimeout(() => table.search(value).draw(), 150);
+            }});
 
             $('#yearFilter').val('{years[0]}');
+            readFilters();
             table.draw();
 
             // Expandable row for flight breakdown
@@ -2758,48 +2983,48 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                 const fb = d.flight_breakdown || {{}};
                 const flights = ['S1', 'S2', 'S3', 'S4', 'D1', 'D2', 'D3', 'D4'];
 
-                let html = '<div class="flight-breakdown">';
-                html += '<span style="font-weight:600;color:#6c757d;margin-right:8px;">Flight Win %:</span>';
+                const parts = ['<div class="flight-breakdown">'];
+                parts.push('<span style="font-weight:600;color:#6c757d;margin-right:8px;">Flight Win %:</span>');
 
                 // Singles
-                html += '<div class="flight-breakdown">';
+                parts.push('<div class="flight-breakdown">');
                 ['S1', 'S2', 'S3', 'S4'].forEach(f => {{
                     const val = fb[f];
                     let cls = 'mid';
                     if (val !== null && val !== undefined) {{
                         if (val >= 70) cls = 'high';
                         else if (val < 40) cls = 'low';
-                        html += `<div class="flight-stat"><span class="flight-stat-label">${{f}}</span><span class="flight-stat-value ${{cls}}">${{val.toFixed(0)}}%</span></div>`;
+                        parts.push(`<div class="flight-stat"><span class="flight-stat-label">${{f}}</span><span class="flight-stat-value ${{cls}}">${{val.toFixed(0)}}%</span></div>`);
                     }} else {{
-                        html += `<div class="flight-stat"><span class="flight-stat-label">${{f}}</span><span class="flight-stat-value mid">—</span></div>`;
+                        parts.push(`<div class="flight-stat"><span class="flight-stat-label">${{f}}</span><span class="flight-stat-value mid">—</span></div>`);
                     }}
                 }});
-                html += '</div>';
+                parts.push('</div>');
 
-                html += '<div class="flight-divider"></div>';
+                parts.push('<div class="flight-divider"></div>');
 
                 // Doubles
-                html += '<div class="flight-breakdown">';
+                parts.push('<div class="flight-breakdown">');
                 ['D1', 'D2', 'D3', 'D4'].forEach(f => {{
                     const val = fb[f];
                     let cls = 'mid';
                     if (val !== null && val !== undefined) {{
                         if (val >= 70) cls = 'high';
                         else if (val < 40) cls = 'low';
-                        html += `<div class="flight-stat"><span class="flight-stat-label">${{f}}</span><span class="flight-stat-value ${{cls}}">${{val.toFixed(0)}}%</span></div>`;
+                        parts.push(`<div class="flight-stat"><span class="flight-stat-label">${{f}}</span><span class="flight-stat-value ${{cls}}">${{val.toFixed(0)}}%</span></div>`);
                     }} else {{
-                        html += `<div class="flight-stat"><span class="flight-stat-label">${{f}}</span><span class="flight-stat-value mid">—</span></div>`;
+                        parts.push(`<div class="flight-stat"><span class="flight-stat-label">${{f}}</span><span class="flight-stat-value mid">—</span></div>`);
                     }}
                 }});
-                html += '</div>';
+                parts.push('</div>');
 
                 // Add totals
-                html += '<div class="flight-divider"></div>';
-                html += `<div class="flight-stat"><span class="flight-stat-label">Total</span><span class="flight-stat-value">${{d.total_flights_won || 0}}/${{d.total_flights_played || 0}}</span></div>`;
-                html += `<div class="flight-stat"><span class="flight-stat-label">FQI+</span><span class="flight-stat-value ${{(d.fqi_plus ?? d.fws_plus) >= 115 ? 'high' : (d.fqi_plus ?? d.fws_plus) < 85 ? 'low' : 'mid'}}">${{d.fqi_plus ?? d.fws_plus ?? 100}}</span></div>`;
+                parts.push('<div class="flight-divider"></div>');
+                parts.push(`<div class="flight-stat"><span class="flight-stat-label">Total</span><span class="flight-stat-value">${{d.total_flights_won || 0}}/${{d.total_flights_played || 0}}</span></div>`);
+                parts.push(`<div class="flight-stat"><span class="flight-stat-label">FQI+</span><span class="flight-stat-value ${{(d.fqi_plus ?? d.fws_plus) >= 115 ? 'high' : (d.fqi_plus ?? d.fws_plus) < 85 ? 'low' : 'mid'}}">${{d.fqi_plus ?? d.fws_plus ?? 100}}</span></div>`);
 
-                html += '</div>';
-                return html;
+                parts.push('</div>');
+                return parts.join('');
             }}
 
             $('#rankingsTable tbody').on('click', 'tr', function() {{
@@ -2841,7 +3066,25 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
             }});
         }});
 
+        // Rankings grouped by year, gender and classification, each group in
+        // rankings order. Built on first use; the playoff and comparison tabs
+        // read their group instead of filtering every row on each click.
+        let rankingGroups = null;
+        function rankingsFor(year, gender, classification) {{
+            if (rankingGroups === null) {{
+                rankingGroups = new Map();
+                rankings.forEach(r => {{
+                    const key = `${{r.year}}|${{r.gender}}|${{r.classification}}`;
+                    const group = rankingGroups.get(key);
+                    if (group) group.push(r);
+                    else rankingGroups.set(key, [r]);
+                }});
+            }}
+            return rankingGroups.get(`${{year}}|${{gender}}|${{classification}}`) || [];
+        }}
+
         let currentPlayoffTeams = [];
+        let currentPlayoffTeamsById = new Map();  // school_id -> row of currentPlayoffTeams
         let currentLeagueTeams = {{}};
 
         function loadTeamsForSelection() {{
@@ -2850,13 +3093,11 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
             const classification = $('#playoffClass').val();
             const minMatches = parseInt($('#playoffMinMatches').val()) || 0;
 
-            currentPlayoffTeams = rankings.filter(r =>
-                r.year === year &&
-                r.gender === gender &&
-                r.classification === classification &&
+            currentPlayoffTeams = rankingsFor(year, gender, classification).filter(r =>
                 r.rank != null &&
                 (r.wins + r.losses + r.ties) >= minMatches
             );
+            currentPlayoffTeamsById = new Map(currentPlayoffTeams.map(t => [t.school_id, t]));
 
             if (currentPlayoffTeams.length === 0) {{
                 $('#playoffResults').html('<p class="text-muted p-3">No teams found for selected criteria.</p>');
@@ -2873,12 +3114,16 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                 }}
             }});
 
+            // League win % per team, computed once for the sorts and H2H passes below
+            const leagueWinPct = new Map(currentPlayoffTeams.map(t =>
+                [t, t.league_wins / Math.max(1, t.league_wins + t.league_losses + t.league_ties)]));
+
             // Sort each league by league win %, then apply H2H tiebreaker, then Power Index
             Object.keys(currentLeagueTeams).forEach(league => {{
                 // First sort by league win % and Power Index
                 currentLeagueTeams[league].sort((a, b) => {{
-                    const aWinPct = a.league_wins / Math.max(1, a.league_wins + a.league_losses + a.league_ties);
-                    const bWinPct = b.league_wins / Math.max(1, b.league_wins + b.league_losses + b.league_ties);
+                    const aWinPct = leagueWinPct.get(a);
+                    const bWinPct = leagueWinPct.get(b);
                     if (bWinPct !== aWinPct) return bWinPct - aWinPct;
                     return b.power_index - a.power_index;
                 }});
@@ -2891,8 +3136,8 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                         const a = currentLeagueTeams[league][i];
                         const b = currentLeagueTeams[league][i + 1];
 
-                        const aWinPct = a.league_wins / Math.max(1, a.league_wins + a.league_losses + a.league_ties);
-                        const bWinPct = b.league_wins / Math.max(1, b.league_wins + b.league_losses + b.league_ties);
+                        const aWinPct = leagueWinPct.get(a);
+                        const bWinPct = leagueWinPct.get(b);
 
                         // Only apply H2H if league win % is close (within 0.1)
                         if (Math.abs(aWinPct - bWinPct) <= 0.1) {{
@@ -2912,11 +3157,11 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
             }});
 
             // Build selection UI
-            let html = '';
+            const parts = [];
             Object.keys(currentLeagueTeams).sort().forEach(league => {{
                 const teams = currentLeagueTeams[league];
-                html += `<div class="league-group">
-                    <div class="league-group-header">${{league}} (${{teams.length}} teams)</div>`;
+                parts.push(`<div class="league-group">
+                    <div class="league-group-header">${{league}} (${{teams.length}} teams)</div>`);
 
                 teams.forEach((team, idx) => {{
                     const isTopTeam = idx === 0;
@@ -2942,7 +3187,7 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                         leagueH2H = ` <span class="text-muted small">[H2H: ${{h2hSummary}}]</span>`;
                     }}
 
-                    html += `
+                    parts.push(`
                         <div class="team-checkbox ${{isTopTeam ? 'selected' : ''}}">
                             <input type="checkbox" id="team_${{team.school_id}}" value="${{team.school_id}}"
                                 ${{isTopTeam ? 'checked' : ''}} onchange="updateTeamSelection(this)">
@@ -2953,12 +3198,12 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                                 </span>
                             </label>
                         </div>
-                    `;
+                    `);
                 }});
-                html += '</div>';
+                parts.push('</div>');
             }});
 
-            $('#leagueTeamsList').html(html);
+            $('#leagueTeamsList').html(parts.join(''));
             $('#autobidSelection').show();
             $('#playoffResults').empty();
         }}
@@ -3455,7 +3700,7 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
             const selectedIds = new Set();
             document.querySelectorAll('#leagueTeamsList input[type="checkbox"]:checked').forEach(cb => {{
                 const schoolId = parseInt(cb.value);
-                const team = currentPlayoffTeams.find(t => t.school_id === schoolId);
+                const team = currentPlayoffTeamsById.get(schoolId);
                 if (team) {{
                     selectedAutoBids.push({{ ...team, qualifyType: 'auto' }});
                     selectedIds.add(schoolId);
@@ -3568,25 +3813,26 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
             }}
 
             // Add APR (Adjusted Playoff Ranking) to each team after all adjustments
+            const movedNames = new Set(adjustedSeeds.map(a => a.team));
             field.forEach((team, idx) => {{
                 team.apr_seed = idx + 1;
-                team.moved_for_home = adjustedSeeds.find(a => a.team === team.school_name) !== undefined;
+                team.moved_for_home = movedNames.has(team.school_name);
             }});
 
-            let html = `
+            const parts = [`
                 <div class="section-title">Qualifying Field (${{field.length}} Teams)</div>
                 <div class="field-list">
                     <div class="field-header d-flex justify-content-between">
                         <span>Seed / Team</span>
                         <span>Record / Power Index</span>
                     </div>
-            `;
+            `];
 
             field.forEach((team, idx) => {{
                 const seed = idx + 1;
                 const hasBye = bracketSize === 12 && seed <= 4;
                 const movedForHome = team.moved_for_home ? '<span class="badge bg-primary text-white ms-1">🏠 Home Guarantee</span>' : '';
-                html += `
+                parts.push(`
                     <div class="field-team">
                         <span class="field-seed">${{seed}}</span>
                         <span class="field-name">${{team.school_name}}</span>
@@ -3599,21 +3845,21 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                         <span class="field-record">${{team.record}}</span>
                         <span class="field-apr">${{team.power_index.toFixed(4)}}</span>
                     </div>
-                `;
+                `);
             }});
 
-            html += '</div>';
+            parts.push('</div>');
 
-            html += `
+            parts.push(`
                 <button id="copyFieldBtn" class="btn btn-sm btn-outline-primary mt-2 mb-2">
                     📋 Copy Qualifying Field
                 </button>
-            `;
+            `);
 
             const autoCount = field.filter(t => t.qualifyType === 'auto').length;
             const atLargeCount = field.filter(t => t.qualifyType === 'atlarge').length;
             const movedCount = adjustedSeeds.length;
-            html += `
+            parts.push(`
                 <div class="section-title mt-3">Summary</div>
                 <div class="bg-white p-3 rounded shadow-sm">
                     <strong>${{field.length}}</strong> teams qualify &bull;
@@ -3622,15 +3868,15 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                     ${{bracketSize === 12 ? ' &bull; Top 4 seeds receive first-round byes' : ''}}
                     ${{movedCount > 0 ? ` &bull; <span class="text-primary"><strong>${{movedCount}}</strong> league champion(s) moved up for home game guarantee</span>` : ''}}
                 </div>
-            `;
+            `);
 
             if (adjustedSeeds.length > 0) {{
-                html += `
+                parts.push(`
                     <div class="alert alert-info mt-2">
                         <strong>🏠 OSAA Home Game Adjustments:</strong><br>
                         ${{adjustedSeeds.map(a => `#${{a.from}} → #${{a.to}}: ${{a.team}}`).join('<br>')}}
                     </div>
-                `;
+                `);
             }}
 
             // Generate matchups based on bracket mode
@@ -3643,34 +3889,34 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
             const osaaMileage = osaaMatchups.reduce((sum, m) => sum + (m.distance || 0), 0);
             const mileageSaved = pureMileage - regionalMileage;
 
-            html += `
+            parts.push(`
                 <div class="section-title mt-3">First Round Matchups</div>
                 <div class="bg-white p-3 rounded shadow-sm">
-            `;
+            `);
 
             if (bracketMode === 'regional') {{
                 const validMileage = !isNaN(pureMileage) && !isNaN(regionalMileage);
                 if (validMileage && mileageSaved > 0) {{
-                    html += `
+                    parts.push(`
                         <div class="alert alert-success mb-3">
                             <strong>🚗 Mileage Savings:</strong> ${{Math.round(mileageSaved)}} miles saved vs pure seeding
                             <br><small>Pure seeding: ${{Math.round(pureMileage)}} mi | Regional: ${{Math.round(regionalMileage)}} mi</small>
                         </div>
-                    `;
+                    `);
                 }} else if (validMileage) {{
-                    html += `
+                    parts.push(`
                         <div class="alert alert-info mb-3">
                             <strong>🚗 Mileage Comparison:</strong> No savings with regional matching
                             <br><small>Pure seeding: ${{Math.round(pureMileage)}} mi | Regional: ${{Math.round(regionalMileage)}} mi</small>
                         </div>
-                    `;
+                    `);
                 }} else {{
-                    html += `
+                    parts.push(`
                         <div class="alert alert-warning mb-3">
                             <strong>⚠️ Mileage:</strong> Unable to calculate distances (missing coordinates)
                             <br><small>Pure: ${{pureMileage}} | Regional: ${{regionalMileage}} | Matchups: ${{pureMatchups.length}} pure, ${{regionalMatchups.length}} regional</small>
                         </div>
-                    `;
+                    `);
                 }}
             }}
 
@@ -3682,26 +3928,26 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                 const upMoves = osaaMatchups.filter(m => m.swapDirection === 'up').length;
 
                 if (unresolvedCount > 0) {{
-                    html += `
+                    parts.push(`
                         <div class="alert alert-warning mb-3">
                             <strong>⚠️ OSAA Bracketing:</strong> ${{unresolvedCount}} same-league matchup(s) could not be resolved after 3 swap attempts
                             <br><small>Resolved: ${{swappedCount}} conflicts | Down moves: ${{downMoves}} | Up moves: ${{upMoves}}</small>
                         </div>
-                    `;
+                    `);
                 }} else if (swappedCount > 0) {{
-                    html += `
+                    parts.push(`
                         <div class="alert alert-success mb-3">
                             <strong>✓ OSAA Bracketing:</strong> All same-league conflicts resolved
                             <br><small>Swaps made: ${{swappedCount}} | Down moves: ${{downMoves}} | Up moves: ${{upMoves}}</small>
                         </div>
-                    `;
+                    `);
                 }} else {{
-                    html += `
+                    parts.push(`
                         <div class="alert alert-info mb-3">
                             <strong>✓ OSAA Bracketing:</strong> No same-league conflicts detected
                             <br><small>Pure seeding maintained</small>
                         </div>
-                    `;
+                    `);
                 }}
             }}
 
@@ -3711,9 +3957,9 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
 
             if (bracketSize === 12) {{
                 // Show bye teams and their potential QF opponents
-                html += `<div class="section-title mt-3">Quarterfinal Preview (Seeds 1-4 have byes)</div>`;
-                html += `<div class="bg-white p-3 rounded shadow-sm mb-3">`;
-                html += `<p class="text-muted small mb-2"><em>After first round, winners are reseeded: #1 plays lowest remaining seed, #4 plays highest.</em></p>`;
+                parts.push(`<div class="section-title mt-3">Quarterfinal Preview (Seeds 1-4 have byes)</div>`);
+                parts.push(`<div class="bg-white p-3 rounded shadow-sm mb-3">`);
+                parts.push(`<p class="text-muted small mb-2"><em>After first round, winners are reseeded: #1 plays lowest remaining seed, #4 plays highest.</em></p>`);
 
                 const byeTeams = field.slice(0, 4);
 
@@ -3734,7 +3980,7 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                     const chalkOpponent = chalkWinners[i];
                     const worstCaseOpponent = firstRoundSeeds.filter(s => s.seed > 8).sort((a, b) => b.seed - a.seed)[i];
 
-                    html += `
+                    parts.push(`
                         <div style="padding:8px 0; border-bottom:1px solid #eee;">
                             <span class="matchup-seed">#${{i + 1}}</span>
                             <strong>${{byeTeam.school_name}}</strong>
@@ -3745,15 +3991,15 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                                 <small>(if chalk)</small>
                             </span>
                         </div>
-                    `;
+                    `);
                 }});
-                html += `</div>`;
+                parts.push(`</div>`);
             }}
 
-            html += `
+            parts.push(`
                 <div class="section-title mt-3">First Round Matchups</div>
                 <div class="bg-white p-3 rounded shadow-sm">
-            `;
+            `);
 
             displayMatchups.forEach(m => {{
                 const conflictBadge = m.conflict ? '<span class="badge bg-warning text-dark ms-1">⚠️ Same League</span>' : '';
@@ -3762,7 +4008,7 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                 const unresolvedBadge = m.unresolvable ? '<span class="badge bg-danger text-white ms-1">⚠️ Unresolved</span>' : '';
                 const tierClass = m.tier === 'flex' ? 'border-start border-info border-3 ps-2' : '';
 
-                html += `
+                parts.push(`
                     <div class="matchup-row ${{tierClass}}" style="padding:8px 0; border-bottom:1px solid #eee;">
                         <span class="matchup-seed">#${{m.seed1}}</span>
                         <strong>${{m.team1?.school_name || 'TBD'}}</strong>
@@ -3772,16 +4018,16 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                         <span class="text-muted ms-2">(${{m.distance === 999 ? '~far' : (m.distance !== undefined ? m.distance : '?')}} mi)</span>
                         ${{conflictBadge}}${{optimizedBadge}}${{swappedBadge}}${{unresolvedBadge}}
                     </div>
-                `;
+                `);
             }});
 
-            html += '</div>';
+            parts.push('</div>');
 
-            html += `
+            parts.push(`
                 <button id="copyMatchupsBtn" class="btn btn-sm btn-outline-primary mt-2 mb-2">
                     📋 Copy First Round Matchups
                 </button>
-            `;
+            `);
 
             // Add "First 4 Out" section - teams that just missed the playoff field
             const fieldSchoolIds = new Set(field.map(t => t.school_id));
@@ -3791,15 +4037,15 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                 .slice(0, 4);
 
             if (firstFourOut.length > 0) {{
-                html += `
+                parts.push(`
                     <div class="section-title mt-4">First 4 Out</div>
                     <div class="bg-light p-3 rounded shadow-sm">
                         <small class="text-muted d-block mb-2">These teams just missed the playoff field:</small>
                         <div class="field-list">
-                `;
+                `);
 
                 firstFourOut.forEach((team, idx) => {{
-                    html += `
+                    parts.push(`
                         <div class="field-team" style="opacity: 0.75;">
                             <span class="field-seed text-muted">-</span>
                             <span class="field-name">${{team.school_name}}</span>
@@ -3808,19 +4054,19 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                             <span class="field-record">${{team.record}}</span>
                             <span class="field-apr">${{team.power_index.toFixed(4)}}</span>
                         </div>
-                    `;
+                    `);
                 }});
 
-                html += `
+                parts.push(`
                         </div>
                         <button id="copyFirstFourOutBtn" class="btn btn-sm btn-outline-secondary mt-2">
                             📋 Copy First 4 Out
                         </button>
                     </div>
-                `;
+                `);
             }}
 
-            $('#playoffResults').html(html);
+            $('#playoffResults').html(parts.join(''));
 
             // Attach copy button event handlers (using event delegation since buttons are dynamically created)
             setTimeout(() => {{
@@ -3953,10 +4199,8 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                 .filter(ls => ls.year === year && ls.gender === gender)
                 .sort((a, b) => b.avg_apr - a.avg_apr);
 
-            const tbody = $('#analysisTable tbody');
-            tbody.empty();
-            filtered.forEach((ls, idx) => {{
-                tbody.append(`
+            // All rows in one assignment: one parse of the markup, not one per row
+            $('#analysisTable tbody').html(filtered.map((ls, idx) => `
                     <tr>
                         <td>${{idx + 1}}</td>
                         <td><span class="badge badge-league">${{ls.league}}</span></td>
@@ -3966,8 +4210,7 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                         <td>${{ls.num_schools}}</td>
                         <td class="school-name">${{ls.top_team}}</td>
                     </tr>
-                `);
-            }});
+                `).join(''));
         }}
 
         $('#refreshAnalysis').on('click', refreshAnalysisTable);
@@ -3976,17 +4219,43 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
         // APR vs State Comparison
         $('#runComparison').on('click', runComparison);
 
+        // Normalize names for matching. The replaces build on each other
+        // ("Barlow High School" only becomes "sam barlow" once " high school"
+        // is gone), so they stay a chain; each distinct name runs it once.
+        const normalizedNames = new Map();
+        function normalizeName(name) {{
+            let norm = normalizedNames.get(name);
+            if (norm === undefined) {{
+                norm = name.toLowerCase()
+                    .replace(/st\\.? mary'?s?.*/i, 'st marys')
+                    .replace(/oregon episcopal school/i, 'oregon episcopal')
+                    .replace(/ high school/i, '')
+                    .replace(/^barlow$/i, 'sam barlow')
+                    .trim();
+                normalizedNames.set(name, norm);
+            }}
+            return norm;
+        }}
+
+        // The data never changes after load, so each combination is
+        // rendered once and its HTML reused on the next Compare.
+        const comparisonHtml = new Map();
+
         function runComparison() {{
             const year = parseInt($('#compYear').val());
             const gender = $('#compGender').val();
             const classification = $('#compClass').val();
             const bracketSize = parseInt($('#compBracket').val());
 
+            const cacheKey = `${{year}}|${{gender}}|${{classification}}|${{bracketSize}}`;
+            const cached = comparisonHtml.get(cacheKey);
+            if (cached !== undefined) {{
+                document.getElementById('comparisonResults').innerHTML = cached;
+                return;
+            }}
+
             // Get all ranked teams for this year/gender/classification
-            const allTeams = rankings.filter(r =>
-                r.year === year &&
-                r.gender === gender &&
-                r.classification === classification &&
+            const allTeams = rankingsFor(year, gender, classification).filter(r =>
                 (r.wins + r.losses + r.ties) >= 3
             ).sort((a, b) => (b.power_index || b.apr) - (a.power_index || a.apr));
 
@@ -4001,29 +4270,32 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                 s.classification === classification
             ).sort((a, b) => a.place - b.place);
 
-            // Helper to normalize names for matching
-            const normalizeName = (name) => name.toLowerCase()
-                .replace(/st\\.? mary'?s?.*/i, 'st marys')
-                .replace(/oregon episcopal school/i, 'oregon episcopal')
-                .replace(/ high school/i, '')
-                .replace(/^barlow$/i, 'sam barlow')
-                .trim();
+            // Every name is normalized once, not once per pair compared below.
+            const teamNorms = allTeams.map(t => normalizeName(t.school_name));
+            const teamLowers = allTeams.map(t => t.school_name.toLowerCase());
+            const stateNorms = stateData.map(s => normalizeName(s.team));
+
+            const QUALIFY_YES = '<span class="badge bg-success">Yes</span>';
+            const QUALIFY_NO = '<span class="badge bg-danger">No</span>';
+            const QUALIFY_NA = '<span class="badge bg-secondary">N/A</span>';
 
             // Match state tournament teams with rankings data
-            const stateTeamsWithRecords = stateData.map(stateTeam => {{
-                const stateNorm = normalizeName(stateTeam.team);
+            const stateTeamsWithRecords = stateData.map((stateTeam, s) => {{
+                const stateNorm = stateNorms[s];
+                const stateLower = stateTeam.team.toLowerCase();
 
-                // Find matching team in rankings
+                // Find matching team in rankings: the first (highest-ranked)
+                // team any of the tests accepts
                 let rankingMatch = null;
                 let piRank = null;
 
                 for (let i = 0; i < allTeams.length; i++) {{
-                    const teamNorm = normalizeName(allTeams[i].school_name);
+                    const teamNorm = teamNorms[i];
                     if (stateNorm === teamNorm ||
                         stateNorm.includes(teamNorm) ||
                         teamNorm.includes(stateNorm) ||
-                        stateTeam.team.toLowerCase().includes(allTeams[i].school_name.toLowerCase()) ||
-                        allTeams[i].school_name.toLowerCase().includes(stateTeam.team.toLowerCase())) {{
+                        stateLower.includes(teamLowers[i]) ||
+                        teamLowers[i].includes(stateLower)) {{
                         rankingMatch = allTeams[i];
                         piRank = i + 1;
                         break;
@@ -4040,22 +4312,32 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                     piRank,
                     hasLosingRecord,
                     wouldQualifyPI,
-                    winPct
+                    winPct,
+                    // Display strings, shared by every table below
+                    recordDisplay: rankingMatch ? rankingMatch.record : 'N/A',
+                    winPctDisplay: winPct !== null ? (winPct * 100).toFixed(0) + '%' : 'N/A',
+                    piRankDisplay: piRank ? '#' + piRank : 'N/A',
+                    qualifyBadge: wouldQualifyPI ? QUALIFY_YES : (rankingMatch ? QUALIFY_NO : QUALIFY_NA)
                 }};
             }});
 
-            // Calculate statistics
-            const teamsWithLosingRecords = stateTeamsWithRecords.filter(t => t.hasLosingRecord);
-            const teamsWouldNotQualify = stateTeamsWithRecords.filter(t => !t.wouldQualifyPI && t.rankingMatch);
-            const piQualifiersNotAtState = piQualifiers.filter(team => {{
-                const teamNorm = normalizeName(team.school_name);
-                return !stateData.some(s => {{
-                    const stateNorm = normalizeName(s.team);
-                    return stateNorm === teamNorm || stateNorm.includes(teamNorm) || teamNorm.includes(stateNorm);
-                }});
+            // Calculate statistics: both subsets in one pass over the placers
+            const teamsWithLosingRecords = [];
+            const teamsWouldNotQualify = [];
+            for (const t of stateTeamsWithRecords) {{
+                if (t.hasLosingRecord) teamsWithLosingRecords.push(t);
+                if (!t.wouldQualifyPI && t.rankingMatch) teamsWouldNotQualify.push(t);
+            }}
+            // piQualifiers is the head of allTeams, so indices line up with teamNorms.
+            // An exact name is one Set lookup; only the rest need the substring scan.
+            const stateNormSet = new Set(stateNorms);
+            const piQualifiersNotAtState = piQualifiers.filter((team, i) => {{
+                const teamNorm = teamNorms[i];
+                if (stateNormSet.has(teamNorm)) return false;
+                return !stateNorms.some(stateNorm => stateNorm.includes(teamNorm) || teamNorm.includes(stateNorm));
             }});
 
-            let html = `
+            const parts = [`
                 <div class="row mb-4">
                     <div class="col-md-3">
                         <div class="comparison-card text-center">
@@ -4082,11 +4364,11 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                         </div>
                     </div>
                 </div>
-            `;
+            `];
 
             // Highlight teams that placed at state with losing records
             if (teamsWithLosingRecords.length > 0) {{
-                html += `
+                parts.push(`
                     <div class="comparison-card" style="border-left: 4px solid #dc3545;">
                         <h5 style="color: #dc3545;">State Placers with Losing Records</h5>
                         <p class="text-muted small">These teams placed at the state tournament despite having losing team records. Under the current individual-based system, 1-2 strong players can carry a team to state success:</p>
@@ -4105,40 +4387,36 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                                     </tr>
                                 </thead>
                                 <tbody>
-                `;
+                `);
+                // A losing record implies a ranking match, so qualifyBadge is Yes or No here
                 teamsWithLosingRecords.forEach(team => {{
-                    const record = team.rankingMatch ? team.rankingMatch.record : 'N/A';
-                    const winPctDisplay = team.winPct !== null ? (team.winPct * 100).toFixed(0) + '%' : 'N/A';
-                    const piRankDisplay = team.piRank ? '#' + team.piRank : 'N/A';
-                    const qualifyBadge = team.wouldQualifyPI ?
-                        '<span class="badge bg-success">Yes</span>' :
-                        '<span class="badge bg-danger">No</span>';
-                    html += `
+                    parts.push(`
                         <tr class="table-danger">
                             <td><strong>${{team.place}}</strong></td>
                             <td class="school-name">${{team.team}}</td>
-                            <td><strong style="color: #dc3545;">${{record}}</strong></td>
-                            <td style="color: #dc3545;">${{winPctDisplay}}</td>
+                            <td><strong style="color: #dc3545;">${{team.recordDisplay}}</strong></td>
+                            <td style="color: #dc3545;">${{team.winPctDisplay}}</td>
                             <td>${{team.entries}}</td>
                             <td>${{team.total_points}}</td>
-                            <td>${{piRankDisplay}}</td>
-                            <td>${{qualifyBadge}}</td>
+                            <td>${{team.piRankDisplay}}</td>
+                            <td>${{team.qualifyBadge}}</td>
                         </tr>
-                    `;
+                    `);
                 }});
-                html += '</tbody></table></div></div>';
+                parts.push('</tbody></table></div></div>');
             }}
 
             // Show PI qualifiers that didn't make it to state
             if (piQualifiersNotAtState.length > 0) {{
-                html += `
+                parts.push(`
                     <div class="comparison-card" style="border-left: 4px solid #198754;">
                         <h5 style="color: #198754;">Teams Rewarded by Power Index (No State Presence)</h5>
                         <p class="text-muted small">These teams would qualify for playoffs under the Power Index system but had no entries at the individual state tournament:</p>
-                `;
+                `);
+                const piRankById = new Map(allTeams.map((t, i) => [t.school_id, i + 1]));
                 piQualifiersNotAtState.slice(0, 10).forEach(team => {{
-                    const piRank = allTeams.findIndex(t => t.school_id === team.school_id) + 1;
-                    html += `
+                    const piRank = piRankById.get(team.school_id);
+                    parts.push(`
                         <div class="team-comparison" style="background: #d1e7dd; padding: 8px; margin: 4px 0; border-radius: 4px;">
                             <span class="tc-rank">#${{piRank}}</span>
                             <span class="tc-name" style="font-weight: bold;">${{team.school_name}}</span>
@@ -4146,16 +4424,16 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                             <span class="tc-apr">PI: ${{(team.power_index || team.apr).toFixed(4)}}</span>
                             <span style="color: #198754;">Full roster depth, no state entries</span>
                         </div>
-                    `;
+                    `);
                 }});
                 if (piQualifiersNotAtState.length > 10) {{
-                    html += `<p class="text-muted small">... and ${{piQualifiersNotAtState.length - 10}} more teams</p>`;
+                    parts.push(`<p class="text-muted small">... and ${{piQualifiersNotAtState.length - 10}} more teams</p>`);
                 }}
-                html += '</div>';
+                parts.push('</div>');
             }}
 
             // Full state tournament results table
-            html += `
+            parts.push(`
                 <div class="comparison-card">
                     <h5>All State Tournament Placers vs Power Index Rankings</h5>
                     <p class="text-muted small">Every team that placed at the ${{year}} ${{classification}} ${{gender === 'boys' ? "Boys'" : "Girls'"}} State Tournament, with their season record and Power Index rank:</p>
@@ -4175,37 +4453,31 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                                 </tr>
                             </thead>
                             <tbody>
-            `;
+            `);
 
             stateTeamsWithRecords.forEach(team => {{
-                const record = team.rankingMatch ? team.rankingMatch.record : 'N/A';
-                const winPctDisplay = team.winPct !== null ? (team.winPct * 100).toFixed(0) + '%' : 'N/A';
                 const piDisplay = team.rankingMatch ? (team.rankingMatch.power_index || team.rankingMatch.apr).toFixed(4) : 'N/A';
-                const piRankDisplay = team.piRank ? '#' + team.piRank : 'N/A';
-                const qualifyBadge = team.wouldQualifyPI ?
-                    '<span class="badge bg-success">Yes</span>' :
-                    (team.rankingMatch ? '<span class="badge bg-danger">No</span>' : '<span class="badge bg-secondary">N/A</span>');
 
                 let rowClass = '';
                 if (team.hasLosingRecord) rowClass = 'table-danger';
                 else if (!team.wouldQualifyPI && team.rankingMatch) rowClass = 'table-warning';
 
-                html += `
+                parts.push(`
                     <tr class="${{rowClass}}">
                         <td><strong>${{team.place}}</strong></td>
                         <td class="school-name">${{team.team}}</td>
-                        <td>${{record}}</td>
-                        <td>${{winPctDisplay}}</td>
+                        <td>${{team.recordDisplay}}</td>
+                        <td>${{team.winPctDisplay}}</td>
                         <td>${{team.entries}}</td>
                         <td>${{team.total_points}}</td>
                         <td class="power-index">${{piDisplay}}</td>
-                        <td>${{piRankDisplay}}</td>
-                        <td>${{qualifyBadge}}</td>
+                        <td>${{team.piRankDisplay}}</td>
+                        <td>${{team.qualifyBadge}}</td>
                     </tr>
-                `;
+                `);
             }});
 
-            html += `
+            parts.push(`
                             </tbody>
                         </table>
                     </div>
@@ -4215,13 +4487,13 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                         <span class="badge bg-light text-dark">White</span> = Would qualify
                     </div>
                 </div>
-            `;
+            `);
 
             // Summary insight
             const losingRecordPct = stateData.length > 0 ? ((teamsWithLosingRecords.length / stateData.length) * 100).toFixed(0) : 0;
             const wouldNotQualifyPct = stateData.length > 0 ? ((teamsWouldNotQualify.length / stateData.length) * 100).toFixed(0) : 0;
 
-            html += `
+            parts.push(`
                 <div class="comparison-card">
                     <h5>Key Insight: Individual vs Team Success</h5>
                     <p><strong>${{losingRecordPct}}%</strong> of teams that placed at the state tournament had <strong>losing records</strong> during the regular season.</p>
@@ -4229,15 +4501,17 @@ def generate_html(rankings, school_data, raw_data_cache, school_info, state_resu
                     <p class="text-muted">This demonstrates how the current individual-based system allows teams to succeed at state on the strength of just 1-2 elite players,
                     even when the team as a whole has a losing record. The Power Index system would instead reward programs that field competitive players across ALL flights throughout the dual match season.</p>
                 </div>
-            `;
+            `);
 
-            $('#comparisonResults').html(html);
+            const html = parts.join('');
+            comparisonHtml.set(cacheKey, html);
+            document.getElementById('comparisonResults').innerHTML = html;
         }}
     </script>
 </body>
 </html>'''
 
-    return html
+    return [head, rankings_json, tail]
 
 
 def render_md_page(md_path, out_path, page_title='Changelog - Oregon HS Tennis'):
@@ -4396,6 +4670,34 @@ def _full_name(player):
     return (fn + ' ' + ln).strip()
 
 
+def _rankings_signature(data_dir, master_school_list):
+    """What build_rankings' output depends on, short of the code itself: every
+    season's files, the school list, and the date-gated model switches."""
+    with os.scandir(data_dir) as it:
+        year_dirs = [e for e in it if e.is_dir()]
+    files = [f.stat().st_mtime_ns for d in year_dirs for f, _, _ in school_files(d)]
+    return (
+        len(files), max(files, default=0), Path(master_school_list).stat().st_mtime_ns,
+        date.today().isoformat(), _adjusted_models_enabled(), _toss_is_primary(),
+    )
+
+
+def load_cached_rankings(cache_file, signature):
+    """The rankings saved by save_cached_rankings, or None unless they were
+    built from inputs with this signature."""
+    try:
+        with open(cache_file, 'rb') as f:
+            cached_signature, rankings = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        return None
+    return rankings if cached_signature == signature else None
+
+
+def save_cached_rankings(cache_file, signature, rankings):
+    with open(cache_file, 'wb') as f:
+        pickle.dump((signature, rankings), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
 def main():
     script_dir = Path(__file__).parent
     repo_root = script_dir
@@ -4408,8 +4710,28 @@ def main():
 
     json_output.parent.mkdir(parents=True, exist_ok=True)
 
-    print("Building rankings...")
-    rankings, school_data, raw_data_cache, school_info = build_rankings(data_dir, master_school_list)
+    # REUSE_RANKINGS=1 skips the rebuild while iterating on the page itself:
+    # the last rankings are reused if the data, school list, date and model
+    # switches are all unchanged. Edits to the ranking code don't invalidate
+    # it, so never set this when changing how rankings are computed.
+    rankings_cache = repo_root / '.rankings_cache.pkl'
+    reuse = os.environ.get('REUSE_RANKINGS') == '1'
+    signature = _rankings_signature(data_dir, master_school_list) if reuse else None
+    rankings = load_cached_rankings(rankings_cache, signature) if reuse else None
+    if rankings is not None:
+        print(f"Reusing rankings from {rankings_cache}")
+        # generate_html only reads the rankings
+        school_data = h2h_meets = school_info = None
+    else:
+        # PARSE_CACHE=1 keeps every parsed school file in .parse_cache.pkl
+        # (a pickle about a third the size of data/, 50 MB for 2024-2026) and
+        # reparses only the files whose mtime or size changed since.
+        parse_cache = repo_root / '.parse_cache.pkl' if os.environ.get('PARSE_CACHE') == '1' else None
+        print("Building rankings...")
+        rankings, school_data, h2h_meets, school_info = build_rankings(
+            data_dir, master_school_list, parse_cache=parse_cache)
+        if reuse:
+            save_cached_rankings(rankings_cache, signature, rankings)
 
     print("Loading state tournament results...")
     state_results = load_state_tournament_results(state_results_file)
@@ -4421,10 +4743,14 @@ def main():
     print(f"JSON saved to {json_output}")
 
     print("Generating HTML dashboard...")
-    html = generate_html(rankings, school_data, raw_data_cache, school_info, state_results)
-
-    with open(output_file, 'w') as f:
-        f.write(html)
+    html_parts = generate_html_parts(rankings, school_data, h2h_meets, school_info, state_results)
+
+    # Each part encoded once and written straight through: a binary file
+    # passes writes larger than its buffer to the OS without copying them.
+    # UTF-8, as the page's <meta charset> says, whatever the locale.
+    with open(output_file, 'wb') as f:
+        for part in html_parts:
+            f.write(part.encode('utf-8'))
 
     print(f"Dashboard saved to {output_file}")
     print(f"Total rankings: {len(rankings)}")
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Request pacing shared by the fetch scripts.
+
+A fixed sleep after each request waits out the whole interval again even when
+the response itself took longer than that. TokenBucket instead spaces the
+*starts* of requests, so slow responses cost no extra wait, and one bucket
+shared by a thread pool caps the rate of the pool as a whole.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Hands out one request slot every `interval` seconds, across threads.
+
+    acquire() reserves the next free slot and sleeps only until it arrives;
+    a caller whose slot is already due does not sleep at all. The bucket holds
+    a single token, so idle time does not build up a burst.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
@@ -11,20 +11,27 @@ Calculates:
 import os
 import json
 import csv
+import re
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-# Flight weights for ranking calculation
-FLIGHT_WEIGHTS = {
-    ('Singles', '1'): 1.0,
-    ('Singles', '2'): 0.75,
-    ('Singles', '3'): 0.25,
-    ('Singles', '4'): 0.10,
-    ('Doubles', '1'): 1.0,
-    ('Doubles', '2'): 0.50,
-    ('Doubles', '3'): 0.25,
-    ('Doubles', '4'): 0.10,
-}
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # optional: load_json falls back to the stdlib
+    orjson = None
+
+# Flight weights for ranking calculation, indexed [match type, flight].
+# Column 0 is the weight of any flight other than 1-4.
+MATCH_TYPES = ('Singles', 'Doubles')
+FLIGHT_WEIGHTS = np.array([
+    # other  1     2     3     4
+    [0.10, 1.0, 0.75, 0.25, 0.10],   # Singles
+    [0.10, 1.0, 0.50, 0.25, 0.10],   # Doubles
+])
+FLIGHT_COLUMN = {'1': 1, '2': 2, '3': 3, '4': 4}
 
 # APR weights
 WWP_WEIGHT = 0.35
@@ -51,27 +58,26 @@ def load_master_school_list(filepath):
     return schools
 
 
+# Titles of meets that are not duals: state championships, districts,
+# tournaments, and events (a title with both "Event" and a "." anywhere).
+_NON_DUAL_TITLE = re.compile(r'State Championship|District|Tournament|^(?=.*Event)(?=.*\.)', re.S)
+
+
 def is_dual_match(meet):
     """Check if a meet is a dual match (not a tournament or event)."""
-    title = meet.get('title', '')
-
-    # Exclude state championships and events
-    if 'State Championship' in title:
-        return False
-    if 'Event' in title and '.' in title:
-        return False
-    if 'District' in title:
-        return False
-    if 'Tournament' in title:
+    # Exclude state championships and events. The title test rejects most
+    # non-duals, so it runs before the schools are looked at.
+    if _NON_DUAL_TITLE.search(meet.get('title') or ''):
         return False
 
     # Dual matches typically have exactly 2 schools (winner + loser)
-    schools = meet.get('schools', {})
-    winners = schools.get('winners', [])
-    losers = schools.get('losers', [])
+    schools = meet.get('schools') or {}
+    winners = schools.get('winners') or ()
+    if len(winners) != 1:
+        return False
 
     # A dual match has 1 winner and 1 loser
-    return len(winners) == 1 and len(losers) == 1
+    return len(schools.get('losers') or ()) == 1
 
 
 def dedupe_meets(meets):
@@ -120,116 +126,194 @@ def dedupe_meets(meets):
     return result
 
 
-def get_flight_weight(match_type, flight):
-    """Get the weight for a given match type and flight."""
-    return FLIGHT_WEIGHTS.get((match_type, str(flight)), 0.10)
+def load_json(path):
+    """Parse a JSON file, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, 'r') as f:
+        return json.load(f)
 
 
-def extract_match_results(meet, school_id):
+def dual_meets(meets):
     """
-    Extract individual match results from a meet.
-    Returns list of (opponent_id, match_type, flight, is_win, weight) tuples.
-    """
-    results = []
-
-    schools = meet.get('schools', {})
-    winners = schools.get('winners', [])
-    losers = schools.get('losers', [])
+    The dual matches among `meets`, as (meet, winner_id, loser_id).
 
-    # Find opponent school
-    opponent_id = None
-    school_is_winner = False
-
-    for w in winners:
-        if w['id'] == school_id:
-            school_is_winner = True
-        else:
-            opponent_id = w['id']
+    A dual has exactly one winner and one loser, so their ids are read here
+    once for every use of the meet after. Every dual is in both schools'
+    files, but each copy is classified on its own: the copies can differ,
+    and one with an empty winners or losers list is not a dual.
+    """
+    duals = []
+    for meet in meets:
+        if is_dual_match(meet):
+            schools = meet['schools']
+            duals.append((meet, schools['winners'][0]['id'], schools['losers'][0]['id']))
+    return duals
 
-    for l in losers:
-        if l['id'] == school_id:
-            school_is_winner = False
-        else:
-            opponent_id = l['id']
 
-    if opponent_id is None:
-        return results
+def aggregate_school(meets, school_id):
+    """
+    Everything build_rankings needs about one school, in one pass over its
+    dual matches (see dual_meets).
+
+    Returns {'results', 'opponents', 'matches_played'}, where results is a
+    list of (opponent_id, type_row, flight_column, is_win) tuples, one per
+    flight the school played, indexing FLIGHT_WEIGHTS, and opponents is the
+    sorted int64 array of the distinct opponent ids in them. weighted_totals
+    adds the WWP figures.
+    """
+    results = []
 
-    # Process individual matches
-    matches = meet.get('matches', {})
+    for meet, winner_id, loser_id in meets:
+        # Find opponent school
+        opponent_id = loser_id if loser_id != school_id else winner_id
+        if opponent_id is None or opponent_id == school_id:
+            continue
 
-    for match_type in ['Singles', 'Doubles']:
-        type_matches = matches.get(match_type, [])
-        if isinstance(type_matches, list):
+        matches = meet.get('matches', {})
+        for type_row, match_type in enumerate(MATCH_TYPES):
+            type_matches = matches.get(match_type, [])
+            if not isinstance(type_matches, list):
+                continue
             for match in type_matches:
-                flight = match.get('flight', '1')
-                weight = get_flight_weight(match_type, flight)
-
-                # Determine if this school won this individual match
-                match_teams = match.get('matchTeams', [])
-                is_win = False
-                played = False
-
-                for team in match_teams:
-                    players = team.get('players', [])
-                    for player in players:
-                        if player.get('schoolId') == school_id:
-                            played = True
-                            is_win = team.get('isWinner', False)
-                            break
-                    if played:
+                # Determine if this school played and won this individual match
+                for team in match.get('matchTeams', []):
+                    if any(p.get('schoolId') == school_id for p in team.get('players', [])):
+                        column = FLIGHT_COLUMN.get(str(match.get('flight', '1')), 0)
+                        results.append((opponent_id, type_row, column, team.get('isWinner', False)))
                         break
 
-                if played:
-                    results.append((opponent_id, match_type, flight, is_win, weight))
+    opponents = np.unique(np.fromiter((r[0] for r in results), dtype=np.int64, count=len(results)))
+    return {'results': results, 'opponents': opponents, 'matches_played': len(results)}
 
-    return results
 
+def weighted_totals(group):
+    """Fill in weighted_wins, weighted_total and wwp for every school in a group.
 
-def process_school_data(data, school_id):
+    `group` maps school_id -> {'results': [...], ...} for one year and gender.
+    All of the group's match results go into flat arrays, the weights come
+    from one FLIGHT_WEIGHTS gather, and one bincount per column sums them by
+    school. bincount adds in row order, so each total is the same float a
+    per-school sum() would give.
+    """
+    ids = list(group)
+    lengths = [len(group[sid]['results']) for sid in ids]
+    rows = [r for sid in ids for r in group[sid]['results']]
+    school_idx = np.repeat(np.arange(len(ids)), lengths)
+    type_row = np.fromiter((r[1] for r in rows), dtype=np.intp, count=len(rows))
+    column = np.fromiter((r[2] for r in rows), dtype=np.intp, count=len(rows))
+    weight = FLIGHT_WEIGHTS[type_row, column]
+    is_win = np.fromiter((bool(r[3]) for r in rows), dtype=bool, count=len(rows))
+
+    wins = np.bincount(school_idx, weights=np.where(is_win, weight, 0.0), minlength=len(ids))
+    total = np.bincount(school_idx, weights=weight, minlength=len(ids))
+    wwp = np.divide(wins, total, out=np.zeros_like(total), where=total != 0)
+
+    for i, sid in enumerate(ids):
+        stats = group[sid]
+        stats['weighted_wins'] = float(wins[i])
+        stats['weighted_total'] = float(total[i])
+        stats['wwp'] = float(wwp[i])
+
+
+def opponent_averages(group):
+    """Fill in owp and apr for every school in a group, and return the APRs as
+    an array in the group's order.
+
+    Every (school, ranked opponent) pair is one edge; bincount over the edge
+    sources sums the opponents' WWP and counts them in one pass. Opponents
+    are looked up with searchsorted against the group's sorted school ids;
+    those with no results in the group are not ranked and don't count.
     """
-    Process all meets for a school and extract match results.
-    Only processes dual matches.
+    ids = np.fromiter(group, dtype=np.int64, count=len(group))
+    by_id = np.argsort(ids, kind='stable')
+    sorted_ids = ids[by_id]
+
+    counts = [len(stats['opponents']) for stats in group.values()]
+    src = np.repeat(np.arange(len(ids)), counts)
+    opp = np.concatenate([stats['opponents'] for stats in group.values()])
+    pos = np.minimum(np.searchsorted(sorted_ids, opp), len(ids) - 1)
+    ranked = sorted_ids[pos] == opp
+    src = src[ranked]
+    dst = by_id[pos[ranked]]
+
+    wwp = np.array([stats['wwp'] for stats in group.values()], dtype=float)
+    owp_sum = np.bincount(src, weights=wwp[dst], minlength=len(ids))
+    owp_count = np.bincount(src, minlength=len(ids))
+    # With no edges at all bincount returns ints even when weighted, so the
+    # output array is made float explicitly.
+    owp = np.divide(owp_sum, owp_count, out=np.zeros(len(ids)), where=owp_count != 0)
+    apr = wwp * WWP_WEIGHT + owp * OWP_WEIGHT
+
+    for i, stats in enumerate(group.values()):
+        stats['owp'] = float(owp[i])
+        stats['apr'] = float(apr[i])
+    return apr
+
+
+def round4(values):
+    """Round an array to 4 places, giving exactly what round(x, 4) gives.
+
+    np.round scales by 10**4 first, and that product can land on (or just
+    off) a .5 that the exact value is not on. Python's round works from the
+    exact binary value, so the handful of near-ties go through it instead.
     """
-    all_results = []
-    opponents = set()
+    out = np.round(values, 4)
+    scaled = values * 1e4
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        out[i] = round(float(values[i]), 4)
+    return out
 
-    for meet in data.get('meets', []):
-        if is_dual_match(meet):
-            results = extract_match_results(meet, school_id)
-            all_results.extend(results)
-            for r in results:
-                opponents.add(r[0])  # opponent_id
 
-    return all_results, opponents
+def process_year(year_dir):
+    """
+    Rank one season: every (year, gender) group in `year_dir`, with wwp, owp
+    and apr filled in.
+
+    Returns {(year, gender): {school_id: stats}}. Seasons share nothing, so
+    build_rankings runs one of these per year in parallel. The per-flight
+    results are dropped from the returned stats; only their counts are
+    needed after this.
+    """
+    year = year_dir.name
+    groups = defaultdict(dict)
 
+    for json_file in year_dir.glob('school_*_gender_*.json'):
+        # Parse filename: school_74814_gender_1.json
+        parts = json_file.stem.split('_')
+        school_id = int(parts[1])
+        gender_id = int(parts[3])
+        gender = GENDER_MAP.get(gender_id, 'Unknown')
 
-def calculate_wwp(results):
-    """Calculate Weighted Win Percentage from match results."""
-    if not results:
-        return 0.0
+        data = load_json(json_file)
 
-    weighted_wins = sum(r[4] for r in results if r[3])  # weight if is_win
-    weighted_total = sum(r[4] for r in results)  # total weights
+        meets = dual_meets(dedupe_meets(data.get('meets', [])))
+        stats = aggregate_school(meets, school_id)
 
-    if weighted_total == 0:
-        return 0.0
+        if stats['results']:  # Only include schools with actual match data
+            groups[(year, gender)][school_id] = stats
 
-    return weighted_wins / weighted_total
+    for group in groups.values():
+        weighted_totals(group)       # WWP
+        opponent_averages(group)     # OWP and APR
+        for stats in group.values():
+            del stats['results']
+    return dict(groups)
 
 
-def build_rankings(data_dir, master_school_list):
+def build_rankings(data_dir, master_school_list, workers=4):
     """
     Build rankings for all schools across all years and genders.
+
+    Years are processed in up to `workers` processes; workers=1 runs them
+    in this process.
     """
     # Load master school list
     school_info = load_master_school_list(master_school_list)
 
-    # First pass: Calculate WWP for all schools
-    # Structure: {year: {gender: {school_id: {'wwp': float, 'opponents': set, 'results': list}}}}
-    school_data = defaultdict(lambda: defaultdict(dict))
-
     data_path = Path(data_dir)
+    year_dirs = []
 
     for year_dir in sorted(data_path.iterdir()):
         if not year_dir.is_dir():
@@ -244,83 +328,51 @@ def build_rankings(data_dir, master_school_list):
             continue
 
         print(f"Processing year {year}...")
-
-        for json_file in year_dir.glob('school_*_gender_*.json'):
-            # Parse filename: school_74814_gender_1.json
-            parts = json_file.stem.split('_')
-            school_id = int(parts[1])
-            gender_id = int(parts[3])
-            gender = GENDER_MAP.get(gender_id, 'Unknown')
-
-            with open(json_file, 'r') as f:
-                data = json.load(f)
-
-            data['meets'] = dedupe_meets(data.get('meets', []))
-            results, opponents = process_school_data(data, school_id)
-
-            if results:  # Only include schools with actual match data
-                wwp = calculate_wwp(results)
-                school_data[year][gender][school_id] = {
-                    'wwp': wwp,
-                    'opponents': opponents,
-                    'results': results,
-                    'matches_played': len(results),
-                    'weighted_wins': sum(r[4] for r in results if r[3]),
-                    'weighted_total': sum(r[4] for r in results),
-                }
-
-    # Second pass: Calculate OWP (average WWP of opponents)
-    for year in school_data:
-        for gender in school_data[year]:
-            for school_id in school_data[year][gender]:
-                school = school_data[year][gender][school_id]
-                opponents = school['opponents']
-
-                opponent_wwps = []
-                for opp_id in opponents:
-                    if opp_id in school_data[year][gender]:
-                        opponent_wwps.append(school_data[year][gender][opp_id]['wwp'])
-
-                if opponent_wwps:
-                    owp = sum(opponent_wwps) / len(opponent_wwps)
-                else:
-                    owp = 0.0
-
-                school['owp'] = owp
-
-                # Calculate APR
-                school['apr'] = (school['wwp'] * WWP_WEIGHT) + (owp * OWP_WEIGHT)
+        year_dirs.append(year_dir)
+
+    # One group per (year, gender), each mapping school_id -> stats.
+    groups = {}
+    if workers > 1 and len(year_dirs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(year_dirs))) as pool:
+            for year_groups in pool.map(process_year, year_dirs):
+                groups.update(year_groups)
+    else:
+        for year_dir in year_dirs:
+            groups.update(process_year(year_dir))
 
     # Build output with school info joined
     output = []
 
-    for year in sorted(school_data.keys()):
-        for gender in sorted(school_data[year].keys()):
-            # Sort by APR descending
-            ranked = sorted(
-                school_data[year][gender].items(),
-                key=lambda x: x[1]['apr'],
-                reverse=True
-            )
-
-            for rank, (school_id, stats) in enumerate(ranked, 1):
-                info = school_info.get(school_id, {})
-
-                output.append({
-                    'year': int(year),
-                    'gender': gender,
-                    'rank': rank,
-                    'school_id': school_id,
-                    'school_name': info.get('name', f'School {school_id}'),
-                    'city': info.get('city', ''),
-                    'classification': info.get('classification', ''),
-                    'league': info.get('league', ''),
-                    'wwp': round(stats['wwp'], 4),
-                    'owp': round(stats['owp'], 4),
-                    'apr': round(stats['apr'], 4),
-                    'matches_played': stats['matches_played'],
-                    'opponents_count': len(stats['opponents']),
-                })
+    for year, gender in sorted(groups):
+        group = groups[(year, gender)]
+
+        # Rank by APR descending; the stable sort keeps ties in file order.
+        ids = list(group)
+        wwp, owp, apr = (np.array([group[sid][k] for sid in ids], dtype=float)
+                         for k in ('wwp', 'owp', 'apr'))
+        order = np.argsort(-apr, kind='stable')
+        wwp, owp, apr = (round4(a).tolist() for a in (wwp, owp, apr))
+
+        for rank, i in enumerate(order.tolist(), 1):
+            school_id = ids[i]
+            stats = group[school_id]
+            info = school_info.get(school_id, {})
+
+            output.append({
+                'year': int(year),
+                'gender': gender,
+                'rank': rank,
+                'school_id': school_id,
+                'school_name': info.get('name', f'School {school_id}'),
+                'city': info.get('city', ''),
+                'classification': info.get('classification', ''),
+                'league': info.get('league', ''),
+                'wwp': wwp[i],
+                'owp': owp[i],
+                'apr': apr[i],
+                'matches_played': stats['matches_played'],
+                'opponents_count': len(stats['opponents']),
+            })
 
     return output
 
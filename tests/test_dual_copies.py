@@ -0,0 +1,54 @@
+"""Each school's copy of a dual is classified on its own in `build_rankings`.
+
+A dual sits in both schools' files and the copies can differ: one may have
+lost its `losers` list. Whichever file is read first, the complete copy must
+count and the broken one must be skipped without raising.
+"""
+import json
+
+import pytest
+
+import generate_site as gs
+
+from conftest import AWAY_ID, HOME_ID
+
+
+def copy_of_meet(losers=True):
+    return {
+        "id": 555,
+        "title": "Away at Home",
+        "meetDateTime": "2026-04-14T12:00:00.000Z",
+        "schools": {
+            "winners": [{"id": HOME_ID, "name": "Home", "score": 5}],
+            "losers": [{"id": AWAY_ID, "name": "Away", "score": 3}] if losers else [],
+        },
+        "matches": {"Singles": [], "Doubles": []},
+    }
+
+
+def test_preprocess_meet_judges_each_copy():
+    good, partial = copy_of_meet(), copy_of_meet(losers=False)
+
+    assert gs.preprocess_meet(partial, HOME_ID) is None
+    assert gs.preprocess_meet(good, AWAY_ID) == gs.DualMeet(good, HOME_ID, AWAY_ID, "loss")
+    assert gs.preprocess_meet(partial, AWAY_ID) is None
+
+
+@pytest.mark.parametrize("partial_for", [HOME_ID, AWAY_ID])
+def test_build_rankings_counts_only_the_complete_copy(tmp_path, partial_for):
+    year = tmp_path / "data" / "2026"
+    year.mkdir(parents=True)
+    for sid in (HOME_ID, AWAY_ID):
+        meet = copy_of_meet(losers=sid != partial_for)
+        (year / f"school_{sid}_gender_1.json").write_text(json.dumps({"meets": [meet]}))
+    master = tmp_path / "master_school_list.csv"
+    master.write_text("id,name,city,state,Classification,League\n"
+                      f"{HOME_ID},Home,Town,OR,5A,5A-9 Test\n"
+                      f"{AWAY_ID},Away,Town,OR,5A,5A-9 Test\n")
+
+    rankings, _, _, _ = gs.build_rankings(str(tmp_path / "data"), str(master))
+
+    records = {e["school_id"]: e["record"] for e in rankings}
+    complete_for = AWAY_ID if partial_for == HOME_ID else HOME_ID
+    assert records.get(complete_for) == ("1-0-0" if complete_for == HOME_ID else "0-1-0")
+    assert records.get(partial_for, "0-0-0") == "0-0-0"
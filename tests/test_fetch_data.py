@@ -0,0 +1,97 @@
+"""`fetch_data.py` without the network.
+
+`render_school_data` must write the bytes `json.dumps(indent=2)` would, since
+merge_entered_data.py compares saved files against that spelling, whichever
+encoder is installed. A conditional request may only vouch for a file on disk
+that the same year, gender and level wrote, because the file name records
+neither the year nor the level.
+"""
+import argparse
+import json
+
+import pytest
+
+import fetch_data
+
+
+@pytest.mark.parametrize("value", [
+    {"name": "Ida B. Wells-Barnett", "score": [6, 4], "ratio": 0.5, "tie": None, "won": True},
+    {"name": "Café Prep"},
+    {"name": "del\x7f"},
+    {"tiny": 1e-05, "small": 1e-07},
+    {"huge": 1e16},
+    {"nan": float("nan"), "inf": float("inf")},
+    {"big": 2 ** 70},
+    {1: "int key"},
+    {"nested": [{"a": [1.5, {"b": 2.5e-10}]}]},
+])
+def test_render_matches_stdlib_spelling(value):
+    assert fetch_data.render_school_data(value) == json.dumps(value, indent=2).encode("utf-8")
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None, etag=None):
+        self.status_code = status_code
+        self._payload = payload
+        self.headers = {"ETag": etag} if etag else {}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    """Serves one payload and ETag per (year, isNotVarsity), and a 304 to any
+    request whose If-None-Match names the current ETag of what it asked for."""
+
+    def __init__(self):
+        self.sent = []
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        year, level = params["year"], params["isNotVarsity"]
+        etag = f'"{year}-{level}"'
+        self.sent.append((year, level, headers.get("If-None-Match")))
+        if headers.get("If-None-Match") == etag:
+            return FakeResponse(304)
+        return FakeResponse(200, {"year": year, "is_not_varsity": level, "meets": []}, etag)
+
+
+def fetch(tmp_path, session, validators, year, jv=0):
+    args = argparse.Namespace(year=year, gender=1, output=str(tmp_path), parquet=None, zip=None)
+    return fetch_data.fetch_and_save({"id": "74614"}, args, jv, validators, session)
+
+
+def test_not_modified_reuses_the_file_on_disk(tmp_path):
+    session, validators = FakeSession(), {}
+    first, path = fetch(tmp_path, session, validators, 2025)
+    again, again_path = fetch(tmp_path, session, validators, 2025)
+
+    assert session.sent[1] == (2025, 0, '"2025-0"')
+    assert again == first == {"year": 2025, "is_not_varsity": 0, "meets": []}
+    assert again_path == path
+
+
+@pytest.mark.parametrize("other_year, other_level", [(2024, 0), (2025, 1)])
+def test_file_from_another_request_is_fetched_in_full(tmp_path, other_year, other_level):
+    session, validators = FakeSession(), {}
+    fetch(tmp_path, session, validators, 2025)
+    fetch(tmp_path, session, validators, other_year, other_level)
+    data, path = fetch(tmp_path, session, validators, 2025)
+
+    # The 2025 ETag would have earned a 304, but the file now holds the
+    # other request's data, so it must not be sent.
+    assert session.sent[2] == (2025, 0, None)
+    assert data == {"year": 2025, "is_not_varsity": 0, "meets": []}
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == data
+
+
+def test_validators_survive_a_save_and_load(tmp_path):
+    session, validators = FakeSession(), {}
+    fetch(tmp_path, session, validators, 2025)
+    fetch_data.save_validators(str(tmp_path), validators)
+
+    fetch(tmp_path, session, fetch_data.load_validators(str(tmp_path)), 2025)
+    assert session.sent[1] == (2025, 0, '"2025-0"')
@@ -0,0 +1,40 @@
+"""Tie-breaks in `find_classification_and_league`.
+
+Every test the matcher runs — exact name, multi-word key, special pattern,
+single word — belongs to one key, and the longest key whose test holds wins
+regardless of which kind of test it is. These names contain two keys of
+different kinds, so they pin that precedence rather than the tier order.
+"""
+import pytest
+
+from create_master_school_list import find_classification_and_league
+
+
+@pytest.mark.parametrize("name, expected", [
+    # A long single-word key beats a shorter multi-word one.
+    ("Mountainside La Grande", ("6A", "Metro (6A-2)")),
+    # A special pattern on a long key beats a shorter multi-word key.
+    ("Trinity La Grande", ("4A/3A/2A/1A", "Special District 1")),
+    # A shorter special loses to a longer multi-word key.
+    ("Sam Barlow North Bend", ("4A/3A/2A/1A", "Special District 3")),
+    ("Independence North Bend", ("4A/3A/2A/1A", "Special District 3")),
+    # Equal lengths resolve in CLASSIFICATION_MAP order.
+    ("Central Sheldon", ("6A", "Southwest (6A-7)")),
+])
+def test_longest_key_wins_across_kinds_of_test(name, expected):
+    assert find_classification_and_league(name) == expected
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("Sam Barlow High School", ("6A", "Mt. Hood (6A-4)")),
+    ("Ida B. Wells-Barnett", ("6A", "PIL (6A-1)")),
+    ("Central (Independence)", ("5A", "Mid-Willamette (5A-3)")),
+    ("Riverside (Boardman)", ("4A/3A/2A/1A", "Special District 4")),
+    ("Riverside (West Linn - Wilsonville)", ("4A/3A/2A/1A", "Special District 1")),
+    ("North Bend", ("4A/3A/2A/1A", "Special District 3")),
+    ("Bend Senior High School", ("5A", "Intermountain (5A-4)")),
+    ("Central Catholic", ("6A", "Mt. Hood (6A-4)")),
+    ("Nowhere Academy", ("Other", "Other")),
+])
+def test_known_names(name, expected):
+    assert find_classification_and_league(name) == expected
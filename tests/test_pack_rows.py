@@ -0,0 +1,49 @@
+"""`pack_rows`, the layout the page's row literals are embedded in.
+
+The page's `unpackRows` rebuilds each object as `keys[row[0]]` zipped with
+the rest of the row; `unpack` below does the same, so these tests hold the
+round trip the browser relies on.
+"""
+import generate_site as gs
+
+
+def unpack(packed):
+    return [dict(zip(packed["keys"][row[0]], row[1:])) for row in packed["rows"]]
+
+
+def test_identical_shapes_share_one_key_list():
+    rows = [
+        {"school_id": 1, "school_name": "Alpha", "power_index": 0.61},
+        {"school_id": 2, "school_name": "Bravo", "power_index": 0.48},
+    ]
+    packed = gs.pack_rows(rows)
+
+    assert packed == {
+        "keys": [["school_id", "school_name", "power_index"]],
+        "rows": [[0, 1, "Alpha", 0.61], [0, 2, "Bravo", 0.48]],
+    }
+    assert unpack(packed) == rows
+
+
+def test_different_key_sets_and_orders_round_trip():
+    rows = [
+        {"school_id": 1, "school_name": "Alpha"},
+        {"school_id": 2, "school_name": "Bravo", "note": None},
+        {"school_name": "Charlie", "school_id": 3},
+        {"school_id": 4, "school_name": "Delta"},
+        {},
+    ]
+    packed = gs.pack_rows(rows)
+
+    # Key order is part of the shape, so the reordered row gets its own.
+    assert packed["keys"] == [
+        ["school_id", "school_name"],
+        ["school_id", "school_name", "note"],
+        ["school_name", "school_id"],
+        [],
+    ]
+    assert [row[0] for row in packed["rows"]] == [0, 1, 2, 0, 3]
+
+    unpacked = unpack(packed)
+    assert unpacked == rows
+    assert [list(r) for r in unpacked] == [list(r) for r in rows]
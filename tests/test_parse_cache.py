@@ -0,0 +1,69 @@
+"""The opt-in parse cache of `build_rankings(parse_cache=...)`.
+
+A cached document is only as good as its (mtime_ns, size) key: a school file
+whose mtime or size moved must be parsed again, and a cache file that cannot
+be read must cost a full parse rather than the build.
+"""
+import json
+import os
+
+import pytest
+
+import generate_site as gs
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    year = tmp_path / "data" / "2026"
+    year.mkdir(parents=True)
+    for sid in (101, 102):
+        (year / f"school_{sid}_gender_1.json").write_text(json.dumps({"meets": []}))
+    master = tmp_path / "master_school_list.csv"
+    master.write_text("id,name,city,state,Classification,League\n"
+                      "101,Alpha,Town,OR,5A,5A-9 Test\n"
+                      "102,Bravo,Town,OR,5A,5A-9 Test\n")
+
+    parsed = []
+    load_json = gs.load_json
+    monkeypatch.setattr(gs, "load_json", lambda path: parsed.append(os.path.basename(path)) or load_json(path))
+    return {"data": tmp_path / "data", "master": master, "year": year,
+            "cache": tmp_path / "parse_cache.pkl", "parsed": parsed}
+
+
+def build(tree):
+    tree["parsed"].clear()
+    gs.build_rankings(str(tree["data"]), str(tree["master"]), parse_cache=tree["cache"])
+    return sorted(tree["parsed"])
+
+
+def test_unchanged_files_come_from_the_cache(tree):
+    assert build(tree) == ["school_101_gender_1.json", "school_102_gender_1.json"]
+    assert build(tree) == []
+
+
+def test_a_file_whose_size_or_mtime_changed_is_parsed_again(tree):
+    build(tree)
+    path = tree["year"] / "school_101_gender_1.json"
+
+    path.write_text(json.dumps({"meets": [], "note": "longer"}))
+    assert build(tree) == ["school_101_gender_1.json"]
+
+    # Same size, newer mtime.
+    path.write_text(json.dumps({"meets": [], "note": "LONGER"}))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert build(tree) == ["school_101_gender_1.json"]
+
+
+def test_a_corrupt_cache_falls_back_to_parsing_everything(tree):
+    build(tree)
+    tree["cache"].write_bytes(b"\x80\x05not a pickle")
+
+    assert gs.load_parse_cache(tree["cache"]) == {}
+    assert build(tree) == ["school_101_gender_1.json", "school_102_gender_1.json"]
+    assert build(tree) == []
+
+
+def test_no_cache_file_is_written_without_the_option(tree):
+    gs.build_rankings(str(tree["data"]), str(tree["master"]))
+    assert not tree["cache"].exists()
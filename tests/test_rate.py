@@ -0,0 +1,77 @@
+"""Request pacing: `rate.TokenBucket` and the fetchers' `AdaptiveDelay`.
+
+The clock is faked, so the tests check the slots each caller is handed rather
+than how long anything really slept.
+"""
+import threading
+
+import pytest
+
+import rate
+from fetch_oregon_schools import AdaptiveDelay
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A frozen monotonic clock; sleep() records the wait and does not advance it."""
+    state = {"now": 100.0, "sleeps": []}
+    monkeypatch.setattr(rate.time, "monotonic", lambda: state["now"])
+    monkeypatch.setattr(rate.time, "sleep", state["sleeps"].append)
+    return state
+
+
+def test_threads_are_handed_slots_one_interval_apart(clock):
+    bucket = rate.TokenBucket(0.25)
+    start = threading.Barrier(8)
+
+    def worker():
+        start.wait()
+        for _ in range(5):
+            bucket.acquire()
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # 40 acquires at one instant: the first is due now, every other one waits
+    # for its own slot, and no two share a slot.
+    assert sorted(clock["sleeps"]) == [pytest.approx(0.25 * k) for k in range(1, 40)]
+
+
+def test_a_caller_whose_slot_is_due_does_not_sleep(clock):
+    bucket = rate.TokenBucket(1.0)
+    bucket.acquire()
+    clock["now"] += 3.0  # the response took longer than the interval
+    bucket.acquire()
+    bucket.acquire()
+
+    # Idle time does not bank a burst: the third caller still waits a slot.
+    assert clock["sleeps"] == [pytest.approx(1.0)]
+
+
+class Response:
+    def __init__(self, status_code, retry_after=None):
+        self.status_code = status_code
+        self.headers = {"Retry-After": retry_after} if retry_after is not None else {}
+
+
+def test_adaptive_delay_follows_the_api():
+    pacer = AdaptiveDelay(initial=1.0, floor=0.25, ceiling=4.0)
+
+    pacer.update(Response(200))
+    assert pacer.interval == 0.5
+    for _ in range(5):
+        pacer.update(Response(200))
+    assert pacer.interval == 0.25
+
+    for _ in range(6):
+        pacer.update(Response(429))
+    assert pacer.interval == 4.0
+
+    pacer.update(Response(503, retry_after="30"))
+    assert pacer.interval == 30.0
+
+    pacer.update(Response(429, retry_after="Wed, 21 Oct 2026 07:28:00 GMT"))
+    assert pacer.interval == 4.0
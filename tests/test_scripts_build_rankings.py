@@ -0,0 +1,64 @@
+"""`scripts/build_rankings.py`, the standalone WWP/OWP/APR ranker.
+
+`scripts/` is not a package, so the module is loaded from its path.
+"""
+import importlib.util
+import json
+import os
+
+import pytest
+
+from conftest import AWAY_ID, HOME_ID, ROOT
+
+_spec = importlib.util.spec_from_file_location(
+    "scripts_build_rankings", os.path.join(ROOT, "scripts", "build_rankings.py"))
+build_rankings = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(build_rankings)
+
+
+def test_a_group_with_no_ranked_opponents_gets_zero_owp():
+    # The only school's opponent has no results in the group, so there are
+    # no opponent edges at all.
+    group = {101: {"results": [(999, 0, 1, True)], "opponents": build_rankings.np.array([999])}}
+    build_rankings.weighted_totals(group)
+    build_rankings.opponent_averages(group)
+
+    assert group[101]["wwp"] == 1.0
+    assert group[101]["owp"] == 0.0
+    assert group[101]["apr"] == pytest.approx(build_rankings.WWP_WEIGHT)
+
+
+def copy_of_meet(losers=True):
+    players = lambda sid: [{"id": sid * 10, "schoolId": sid}]  # noqa: E731
+    return {
+        "id": 555,
+        "title": "Away at Home",
+        "meetDateTime": "2026-04-14T12:00:00.000Z",
+        "schools": {
+            "winners": [{"id": HOME_ID, "name": "Home", "score": 1}],
+            "losers": [{"id": AWAY_ID, "name": "Away", "score": 0}] if losers else [],
+        },
+        "matches": {"Singles": [{
+            "id": 1, "flight": "1", "matchType": "Singles", "sets": [],
+            "matchTeams": [{"id": 1, "isWinner": True, "players": players(HOME_ID)},
+                           {"id": 2, "isWinner": False, "players": players(AWAY_ID)}],
+        }], "Doubles": []},
+    }
+
+
+@pytest.mark.parametrize("partial_for", [HOME_ID, AWAY_ID])
+def test_each_copy_of_a_dual_is_classified_on_its_own(tmp_path, partial_for):
+    # Both schools' files hold meet 555, but one copy has lost its losers
+    # list. Whichever file is read first, the complete copy counts and the
+    # broken one is skipped without raising.
+    year = tmp_path / "2026"
+    year.mkdir()
+    for sid in (HOME_ID, AWAY_ID):
+        meet = copy_of_meet(losers=sid != partial_for)
+        (year / f"school_{sid}_gender_1.json").write_text(json.dumps({"meets": [meet]}))
+
+    groups = build_rankings.process_year(year)
+
+    complete_for = AWAY_ID if partial_for == HOME_ID else HOME_ID
+    assert set(groups[("2026", "Boys")]) == {complete_for}
+    assert groups[("2026", "Boys")][complete_for]["matches_played"] == 1